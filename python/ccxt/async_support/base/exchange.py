@@ -15,12 +15,14 @@ import ssl
 import sys
 import yarl
 import math
+import random
 from typing import Any, List
 from ccxt.base.types import Int, Str, Num, Strings
 
 # -----------------------------------------------------------------------------
 
-from ccxt.async_support.base.throttler import Throttler
+from ccxt.async_support.base.throttler import Throttler, MultiThrottler, shared_throttler
+from ccxt.async_support.base.transport import HttpxTransport
 
 # -----------------------------------------------------------------------------
 
@@ -35,8 +37,11 @@ from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
 
 from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.fast_client import FastClient
-from ccxt.async_support.base.ws.future import Future
-from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
+from ccxt.async_support.base.ws.future import Future, FanIn
+from ccxt.async_support.base.ws.stream import Stream, current_stream
+from ccxt.async_support.base.ws.histogram import prometheus_counter_text, prometheus_name, prometheus_text
+from ccxt.async_support.base.ws.cache import BaseCache
+from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook, ArrayOrderBook, LazyOrderBook, QueuedOrderBook
 
 
 # -----------------------------------------------------------------------------
@@ -65,6 +70,20 @@ class Exchange(BaseExchange):
     ping = None
     newUpdates = True
     clients = {}
+    # share the rate limiter with other instances in the process
+    # None - private, 'apiKey' - instances of this exchange with the same apiKey
+    # 'host' - all instances of this exchange, any other string - used as the name
+    rateLimiterScope = None
+    # sync the rate limiter with the quota headers declared in options['rateLimitHeaders']
+    adaptiveRateLimit = False
+    # priority lanes of the rate limiter, enabled by options['rateLimiterPriority'], the first is served first
+    rateLimiterPriorities = ['trading', 'account', 'market', 'backfill']
+    # extra aiohttp.TCPConnector arguments, like limit_per_host, keepalive_timeout, ttl_dns_cache, happy_eyeballs_delay
+    aiohttp_connector_options = {}
+    # send the rest requests over http/2 with the httpx transport, or set the transport to another implementation
+    http2 = False
+    transport = None
+    last_connection_reused = None
 
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
@@ -78,9 +97,141 @@ class Exchange(BaseExchange):
         self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        self.markets_refreshing = None
+        self.connection_stats = {
+            'created': 0,
+            'reused': 0,
+        }
+        self.shards = {}  # url -> the urls of its ws connections, see shard_url()
+        self.unsharded = set()  # the urls that are used directly with client(), see shard_url()
 
     def init_rest_rate_limiter(self):
-        self.throttle = Throttler(self.tokenBucket, self.asyncio_loop)
+        name = self.rate_limiter_name()
+        self.throttle = self.create_throttler(name, self.tokenBucket)
+        # options['rateLimiterBuckets'] = {'orders': {'refillRate': 10 / 1000, 'capacity': 10, 'tokens': 10, 'methods': ['POST'], 'paths': ['order']}}
+        buckets = self.safe_value(self.options, 'rateLimiterBuckets')
+        if buckets:
+            throttlers = {'default': self.throttle}
+            for bucket in buckets:
+                throttlers[bucket] = self.create_throttler(None if name is None else name + ':' + bucket, buckets[bucket])
+            self.throttle = MultiThrottler(throttlers)
+        # options['rateLimiterPriority'] = {'default': 'market', 'methods': {'DELETE': 'trading'}, 'paths': {'klines': 'backfill'}}
+        priorities = self.safe_value(self.options, 'rateLimiterPriority')
+        if buckets or priorities is not None:
+            # fetch2 passes the result straight to self.throttle
+            self.calculate_rate_limiter_cost = self.calculate_rate_limiter_request_cost
+
+    def rate_limiter_name(self):
+        scope = self.rateLimiterScope
+        if scope is None:
+            return None
+        elif scope == 'apiKey':
+            return self.id + ':' + self.apiKey
+        elif scope == 'host':
+            return self.id
+        return scope
+
+    def create_throttler(self, name, config):
+        if name is None:
+            return Throttler(config, self.asyncio_loop)
+        return shared_throttler(name, config, self.asyncio_loop)
+
+    def calculate_rate_limiter_request_cost(self, api, method, path, params, config={}):
+        cost = type(self).calculate_rate_limiter_cost(self, api, method, path, params, config)
+        buckets = self.safe_value(self.options, 'rateLimiterBuckets')
+        if buckets:
+            cost = {
+                'default': cost,
+            }
+            for bucket in buckets:
+                bucket_config = buckets[bucket]
+                methods = self.safe_value(bucket_config, 'methods')
+                paths = self.safe_value(bucket_config, 'paths')
+                if (methods is None or method in methods) and (paths is None or path in paths):
+                    cost[bucket] = self.safe_value(bucket_config, 'cost', 1)
+        if self.safe_value(self.options, 'rateLimiterPriority') is not None:
+            return (cost, self.rate_limiter_priority(method, path, params))
+        return cost
+
+    def rate_limiter_priority(self, method, path, params):
+        config = self.safe_value(self.options, 'rateLimiterPriority', {})
+        priority = None
+        if isinstance(params, dict) and 'rateLimiterPriority' in params:
+            # removed here so that it is not sent to the exchange
+            priority = params.pop('rateLimiterPriority')
+        if priority is None:
+            priority = self.safe_value(self.safe_value(config, 'paths', {}), path)
+        if priority is None:
+            priority = self.safe_value(self.safe_value(config, 'methods', {}), method)
+        if priority is None:
+            priority = self.safe_value(config, 'default', 'market')
+        if isinstance(priority, str):
+            if priority not in self.rateLimiterPriorities:
+                raise ExchangeError(self.id + ' rateLimiterPriority must be one of ' + ', '.join(self.rateLimiterPriorities))
+            priority = self.rateLimiterPriorities.index(priority)
+        return priority
+
+    def rate_limit_headers_config(self, url=None):
+        # options['rateLimitHeaders'] is either one config for every response or a config per api name,
+        # the config of the api with the longest url that the request url starts with is used
+        config = self.safe_value(self.options, 'rateLimitHeaders')
+        if config is None or any(key in config for key in ('used', 'remaining', 'limit', 'retryAfter')):
+            return config
+        urls = self.safe_value(self.urls, 'api')
+        if url is None or not isinstance(urls, dict):
+            return None
+        result = None
+        length = -1
+        for api in config:
+            base = urls.get(api)
+            if isinstance(base, str) and url.startswith(base) and len(base) > length:
+                result = config[api]
+                length = len(base)
+        return result
+
+    def handle_rate_limit_headers(self, code, headers, url=None):
+        # options['rateLimitHeaders'] = {
+        #     'used': 'x-mbx-used-weight-1m',  # or 'remaining', the header with the used or the remaining quota
+        #     'limit': 1200,  # the size of the quota, a number or a header
+        #     'window': 60000,  # the quota resets every window milliseconds
+        #     'reset': 'x-ratelimit-reset',  # or the header with the timestamp of the reset in milliseconds
+        #     'retryAfter': 'retry-after',  # the header with the seconds to wait after a 429
+        #     'scale': 1,  # cost units per unit of quota, derived from the refillRate and the window by default
+        # }
+        # or options['rateLimitHeaders'] = {'public': {...}, 'sapi': {...}} with one such config per api name
+        config = self.rate_limit_headers_config(url)
+        if config is None:
+            return
+        headers = {key.lower(): headers[key] for key in headers}
+        now = self.milliseconds()
+        retry_after = self.safe_number(headers, self.safe_string_lower(config, 'retryAfter', 'retry-after'))
+        if (code == 429 or code == 418) and retry_after is not None:
+            self.throttle.update(0, retry_after * 1000)
+            return
+        limit = self.safe_value(config, 'limit')
+        if isinstance(limit, str):
+            limit = self.safe_number(headers, limit.lower())
+        remaining = None
+        if 'remaining' in config:
+            remaining = self.safe_number(headers, config['remaining'].lower())
+        elif 'used' in config:
+            used = self.safe_number(headers, config['used'].lower())
+            if used is not None and limit is not None:
+                remaining = limit - used
+        window = self.safe_integer(config, 'window')
+        reset = None
+        if 'reset' in config:
+            timestamp = self.safe_integer(headers, config['reset'].lower())
+            if timestamp is not None:
+                reset = timestamp - now
+        elif window is not None:
+            reset = window - now % window
+        if remaining is None or reset is None:
+            return
+        scale = self.safe_number(config, 'scale')
+        if scale is None:
+            scale = self.tokenBucket['refillRate'] * window / limit if (window is not None and limit) else 1
+        self.throttle.update(remaining * scale, reset)
 
     def get_event_loop(self):
         return self.asyncio_loop
@@ -114,15 +265,79 @@ class Exchange(BaseExchange):
 
         if self.own_session and self.session is None:
             # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl=self.ssl_context, loop=self.asyncio_loop, enable_cleanup_closed=True)
-            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
+            connector = aiohttp.TCPConnector(ssl=self.ssl_context, loop=self.asyncio_loop, enable_cleanup_closed=True, **self.aiohttp_connector_options)
+            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env, trace_configs=[self.connection_trace_config()])
+
+        if self.http2 and self.transport is None:
+            self.transport = HttpxTransport(self.id, self.ssl_context, self.aiohttp_trust_env)
+
+    def connection_trace_config(self):
+        # records whether each request opened a new connection or reused a pooled one
+        async def on_connection_create_end(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx['reused'] = False
+
+        async def on_connection_reuseconn(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx['reused'] = True
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def api_hosts(self, urls=None):
+        urls = self.safe_value(self.urls, 'api', {}) if urls is None else urls
+        if isinstance(urls, dict):
+            urls = list(urls.values())
+        elif isinstance(urls, str):
+            urls = [urls]
+        hosts = []
+        for url in urls:
+            if isinstance(url, (dict, list)):
+                candidates = self.api_hosts(url)
+            elif isinstance(url, str) and url.startswith('http'):
+                candidates = [str(yarl.URL(self.implode_hostname(url)).origin())]
+            else:
+                candidates = []
+            for host in candidates:
+                if host not in hosts:
+                    hosts.append(host)
+        return hosts
+
+    async def warmup(self, connections=1, hosts=None):
+        """opens connections to the api hosts ahead of the first requests, returns the number of connections opened for each host"""
+        self.open()
+        if hosts is None:
+            hosts = self.api_hosts()
+
+        async def connect(host):
+            try:
+                if self.transport is not None:
+                    await self.transport.request('HEAD', host, {}, None, self.timeout / 1000)
+                else:
+                    async with self.session.head(host, timeout=aiohttp.ClientTimeout(total=self.timeout / 1000)) as response:
+                        await response.read()
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError, BaseError) as e:
+                self.logger.debug('%s warmup %s failed: %s', self.id, host, e)
+                return False
+
+        results = await asyncio.gather(*[connect(host) for host in hosts for _ in range(connections)])
+        return {host: sum(results[i * connections:(i + 1) * connections]) for i, host in enumerate(hosts)}
 
     async def close(self):
+        if self.markets_refreshing is not None:
+            self.markets_refreshing.cancel()
+            self.markets_refreshing = None
         await self.ws_close()
         if self.session is not None:
             if self.own_session:
                 await self.session.close()
             self.session = None
+        if self.http2 and self.transport is not None:
+            await self.transport.close()
+            self.transport = None
         await self.close_proxy_sessions()
 
     async def close_proxy_sessions(self):
@@ -188,41 +403,55 @@ class Exchange(BaseExchange):
         request_body = body
         encoded_body = body.encode() if body else None
         self.open()
+        if self.transport is not None and (final_proxy is not None or proxy_session is not None):
+            raise NotSupported(self.id + ' proxy agents are not supported by the transport, use the proxyUrl instead')
         final_session = proxy_session if proxy_session is not None else self.session
         session_method = getattr(final_session, method.lower())
 
         http_response = None
+        http_content = None
         http_status_code = None
         http_status_text = None
         json_response = None
+        trace_request_ctx = {'reused': None}
         try:
-            async with session_method(yarl.URL(url, encoded=True),
-                                      data=encoded_body,
-                                      headers=request_headers,
-                                      timeout=(self.timeout / 1000),
-                                      proxy=final_proxy) as response:
-                http_response = await response.text(errors='replace')
-                # CIMultiDictProxy
-                raw_headers = response.headers
-                headers = {}
-                for header in raw_headers:
-                    if header in headers:
-                        headers[header] = headers[header] + ', ' + raw_headers[header]
-                    else:
-                        headers[header] = raw_headers[header]
-                http_status_code = response.status
-                http_status_text = response.reason
-                http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
-                json_response = self.parse_json(http_response)
-                if self.enableLastHttpResponse:
-                    self.last_http_response = http_response
-                if self.enableLastResponseHeaders:
-                    self.last_response_headers = headers
-                if self.enableLastJsonResponse:
-                    self.last_json_response = json_response
-                if self.verbose:
-                    self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody:", http_response)
-                self.logger.debug("%s %s, Response: %s %s %s", method, url, http_status_code, headers, http_response)
+            if self.transport is not None:
+                http_status_code, http_status_text, headers, http_response, http_content = await self.transport.request(method, url, request_headers, encoded_body, self.timeout / 1000)
+            else:
+                async with session_method(yarl.URL(url, encoded=True),
+                                          data=encoded_body,
+                                          headers=request_headers,
+                                          timeout=(self.timeout / 1000),
+                                          proxy=final_proxy,
+                                          trace_request_ctx=trace_request_ctx) as response:
+                    self.last_connection_reused = trace_request_ctx['reused']
+                    if self.last_connection_reused is not None:
+                        self.connection_stats['reused' if self.last_connection_reused else 'created'] += 1
+                    http_response = await response.text(errors='replace')
+                    http_content = response.content
+                    # CIMultiDictProxy
+                    raw_headers = response.headers
+                    headers = {}
+                    for header in raw_headers:
+                        if header in headers:
+                            headers[header] = headers[header] + ', ' + raw_headers[header]
+                        else:
+                            headers[header] = raw_headers[header]
+                    http_status_code = response.status
+                    http_status_text = response.reason
+            http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
+            json_response = self.parse_json(http_response)
+            if self.enableLastHttpResponse:
+                self.last_http_response = http_response
+            if self.enableLastResponseHeaders:
+                self.last_response_headers = headers
+            if self.enableLastJsonResponse:
+                self.last_json_response = json_response
+            if self.adaptiveRateLimit:
+                self.handle_rate_limit_headers(http_status_code, headers, url)
+            if self.verbose:
+                self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody:", http_response)
+            self.logger.debug("%s %s, Response: %s %s %s", method, url, http_status_code, headers, http_response)
 
         except socket.gaierror as e:
             details = ' '.join([self.id, method, url])
@@ -248,7 +477,7 @@ class Exchange(BaseExchange):
             return http_response
         if http_response == '' or http_response is None:
             return http_response
-        return response.content
+        return http_content
 
     async def load_markets_helper(self, reload=False, params={}):
         if not reload:
@@ -256,10 +485,19 @@ class Exchange(BaseExchange):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        if self.share_markets and not params:
+            return await self.load_shared_markets(reload)
+        return await self.fetch_and_set_markets(reload, params)
+
+    async def fetch_and_set_markets(self, reload=False, params={}):
+        if not reload and self.markets_cache_dir and not params and self.load_markets_from_cache():
+            return self.markets
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = await self.fetch_currencies()
         markets = await self.fetch_markets(params)
+        if self.markets_cache_dir and not params:
+            self.write_markets_cache(markets, currencies)
         return self.set_markets(markets, currencies)
 
     async def load_markets(self, reload=False, params={}):
@@ -277,6 +515,42 @@ class Exchange(BaseExchange):
         self.reloading_markets = False
         return result
 
+    async def load_shared_markets(self, reload=False):
+        shared = self.shared_markets()
+        loading = shared.loading
+        # a load in flight on this event loop is joined, a reload included, an instance
+        # that is cancelled while it waits does not cancel the load of the others
+        if loading is not None and not loading.done() and loading.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(loading)
+            return shared.attach(self)
+        if shared.snapshot is not None and not reload:
+            return shared.attach(self)
+        shared.loading = asyncio.ensure_future(self.fetch_and_publish_markets(shared, reload))
+        await asyncio.shield(shared.loading)
+        return self.markets
+
+    async def fetch_and_publish_markets(self, shared, reload=False):
+        await self.fetch_and_set_markets(reload)
+        shared.publish(self)
+
+    def refresh_markets_cache(self):
+        # the cached markets are used meanwhile
+        self.markets_refreshing = asyncio.ensure_future(self.update_markets_cache())
+        return self.markets_refreshing
+
+    async def update_markets_cache(self):
+        try:
+            currencies = None
+            if self.has['fetchCurrencies'] is True:
+                currencies = await self.fetch_currencies()
+            markets = await self.fetch_markets()
+            self.write_markets_cache(markets, currencies)
+            self.set_markets(markets, currencies)
+            if self.share_markets:
+                self.shared_markets().publish(self)
+        except Exception as e:
+            self.logger.warning('%s could not refresh the markets cache: %s', self.id, e)
+
     async def load_fees(self, reload=False):
         if not reload:
             if self.loaded_fees != Exchange.loaded_fees:
@@ -342,15 +616,35 @@ class Exchange(BaseExchange):
         return gunzip(data)
 
     def order_book(self, snapshot={}, depth=None):
+        # options['ws']['orderBookStorage'] = 'array' keeps the levels in float arrays
+        # and 'lazy' additionally builds the bids and asks lists only when they are read
+        ws_options = self.safe_value(self.options, 'ws', {})
+        storage = self.safe_string(ws_options, 'orderBookStorage')
+        if storage == 'array':
+            return ArrayOrderBook(snapshot, depth)
+        elif storage == 'lazy':
+            return LazyOrderBook(snapshot, depth)
         return OrderBook(snapshot, depth)
 
     def indexed_order_book(self, snapshot={}, depth=None):
+        # options['ws']['indexedOrderBookStorage'] = 'queue' keeps a queue of orders per price
+        # level for l3 books with many orders at one price, orders at the same price are then
+        # in arrival order instead of sorted by id and the whole side is kept beyond the depth
+        ws_options = self.safe_value(self.options, 'ws', {})
+        if self.safe_string(ws_options, 'indexedOrderBookStorage') == 'queue':
+            return QueuedOrderBook(snapshot, depth)
         return IndexedOrderBook(snapshot, depth)
 
     def counted_order_book(self, snapshot={}, depth=None):
         return CountedOrderBook(snapshot, depth)
 
     def client(self, url):
+        # an exchange that takes a connection directly, to authenticate it for one,
+        # needs the later subscriptions to that url on the same connection
+        self.unsharded.add(url)
+        return self.connection(url)
+
+    def connection(self, url):
         self.clients = self.clients or {}
         if url not in self.clients:
             on_message = self.handle_message
@@ -359,17 +653,91 @@ class Exchange(BaseExchange):
             on_connected = self.on_connected
             # decide client type here: aiohttp ws / websockets / signalr / socketio
             ws_options = self.safe_value(self.options, 'ws', {})
+            # ws clients share their own bucket, separate from the rest one
+            name = self.rate_limiter_name()
+            throttle = self.create_throttler(None if name is None else name + ':ws', self.tokenBucket)
             options = self.extend(self.streaming, {
                 'log': getattr(self, 'log'),
                 'ping': getattr(self, 'ping', None),
                 'verbose': self.verbose,
-                'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
+                'throttle': throttle,
                 'asyncio_loop': self.asyncio_loop,
+                'json_loads': self.json_loads,
             }, ws_options)
             self.clients[url] = FastClient(url, on_message, on_error, on_close, on_connected, options)
             self.clients[url].proxy = self.get_ws_proxy()
         return self.clients[url]
 
+    def shard_url(self, url, subscribe_hashes):
+        # spreads the subscriptions to one url over several connections, configured with
+        # options['ws']['sharding'] = {
+        #     'maxSubscriptions': subscribe hashes per connection,
+        #     'maxConnections': connections per url, unlimited by default,
+        #     'maxMessagesPerSecond': opens another connection rather than adding to a busier one,
+        # }
+        # the other connections get a url fragment that is not sent to the server, like wss://host/ws#1
+        # a url that the exchange also uses with client() directly, like the private url that
+        # authenticate() logs in on, keeps all its new subscriptions on the one connection
+        ws_options = self.safe_value(self.options, 'ws', {})
+        sharding = self.safe_value(ws_options, 'sharding')
+        if sharding is None:
+            return url
+        clients = self.clients or {}
+        if url not in self.shards:
+            self.shards[url] = [url]
+        names = self.shards[url]
+        active = [name for name in names if name in clients]
+        for name in active:
+            subscriptions = clients[name].subscriptions
+            for subscribe_hash in subscribe_hashes:
+                if subscribe_hash in subscriptions:
+                    return name
+        if url in self.unsharded:
+            return url
+        max_subscriptions = self.safe_integer(sharding, 'maxSubscriptions')
+        max_connections = self.safe_integer(sharding, 'maxConnections')
+        max_rate = self.safe_number(sharding, 'maxMessagesPerSecond')
+        best = None
+        for name in active:
+            if max_subscriptions is not None and len(clients[name].subscriptions) + len(subscribe_hashes) > max_subscriptions:
+                continue
+            if best is None or clients[name].message_rate() < clients[best].message_rate():
+                best = name
+        can_open = max_connections is None or len(active) < max_connections
+        if best is not None and (not can_open or max_rate is None or clients[best].message_rate() < max_rate):
+            return best
+        if not can_open:
+            raise ExchangeError(self.id + ' all ' + str(max_connections) + ' connections to ' + url + ' have ' + str(max_subscriptions) + ' subscriptions')
+        for name in names:
+            if name not in clients:
+                return name
+        name = url + '#' + str(len(names))
+        names.append(name)
+        return name
+
+    def ws_stats(self):
+        # the ingest latency of every ws connection, recorded with options['ws']['instrumentation'] = True,
+        # and the number of results of every conflated subscription that were replaced by a newer one
+        clients = self.clients or {}
+        return {url: clients[url].stats() for url in clients}
+
+    def ws_stats_prometheus(self):
+        clients = self.clients or {}
+        series = {}
+        conflated = []
+        for url in clients:
+            client = clients[url]
+            for name in client.histograms:
+                series.setdefault(name, []).append(({'exchange': self.id, 'url': url}, client.histograms[name]))
+            for topic in client.handler_histograms:
+                series.setdefault('handler', []).append(({'exchange': self.id, 'url': url, 'topic': topic}, client.handler_histograms[topic]))
+            for message_hash in client.conflated_messages:
+                conflated.append(({'exchange': self.id, 'url': url, 'message_hash': message_hash}, client.conflated_messages[message_hash]))
+        text = ''.join(prometheus_text('ccxt_ws_' + prometheus_name(name) + '_milliseconds', 'ws message ' + prometheus_name(name).replace('_', ' ') + ' time in milliseconds', series[name]) for name in sorted(series))
+        if conflated:
+            text += prometheus_counter_text('ccxt_ws_conflated_messages_total', 'ws results replaced by a newer one before they were delivered', conflated)
+        return text
+
     def get_ws_proxy(self):
         httpProxy, httpsProxy, socksProxy = self.check_ws_proxy_settings()
         if httpProxy:
@@ -393,9 +761,19 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
-
-        future = Future.race([client.future(message_hash) for message_hash in message_hashes])
+        if subscribe_hashes:
+            url = self.shard_url(url, subscribe_hashes)
+        client = self.connection(url)
+        stream = current_stream.get()
+        if stream is not None:
+            for message_hash in message_hashes:
+                stream.attach(client, message_hash)
+
+        key = tuple(message_hashes)
+        fan_in = client.fan_ins.get(key)
+        if fan_in is None:
+            fan_in = client.fan_ins[key] = FanIn(client, message_hashes)
+        future = fan_in.wait()
 
         missing_subscriptions = []
         if subscribe_hashes is not None:
@@ -412,6 +790,9 @@ class Exchange(BaseExchange):
             options = self.safe_value(self.options, 'ws')
             cost = self.safe_value(options, 'cost', 1)
             if message:
+                for subscribe_hash in missing_subscriptions:
+                    client.subscribe_messages[subscribe_hash] = message
+
                 async def send_message():
                     if self.enableRateLimit:
                         await client.throttle(cost)
@@ -432,7 +813,12 @@ class Exchange(BaseExchange):
         # base exchange self.open starts the aiohttp Session in an async context
         self.open()
         backoff_delay = 0
-        client = self.client(url)
+        if subscribe_hash is not None:
+            url = self.shard_url(url, [subscribe_hash])
+        client = self.connection(url)
+        stream = current_stream.get()
+        if stream is not None:
+            stream.attach(client, message_hash)
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -450,6 +836,8 @@ class Exchange(BaseExchange):
             options = self.safe_value(self.options, 'ws')
             cost = self.safe_value(options, 'cost', 1)
             if message:
+                client.subscribe_messages[subscribe_hash] = message
+
                 async def send_message():
                     if self.enableRateLimit:
                         await client.throttle(cost)
@@ -466,17 +854,61 @@ class Exchange(BaseExchange):
 
         return future
 
+    async def stream_watch(self, method, *args, maxsize=1000, conflate=False):
+        """
+        yields every result resolved for the subscriptions of a watch method, e.g. stream_watch('watch_ticker', symbol)
+        the results are queued while the consumer is busy, up to maxsize, or only the latest one with conflate
+        """
+        stream = Stream(maxsize, conflate)
+        token = current_stream.set(stream)
+        try:
+            # subscribes and attaches the stream, the first result is queued as well
+            await getattr(self, method)(*args)
+        except Exception:
+            stream.close()
+            raise
+        finally:
+            current_stream.reset(token)
+        try:
+            async for result in stream:
+                yield result
+        finally:
+            stream.close()
+
+    async def stream_order_book(self, symbol: str, limit: Int = None, params={}, conflate=True):
+        # the order book is updated in place, so by default only its latest state is delivered
+        async for orderbook in self.stream_watch('watch_order_book', symbol, limit, params, conflate=conflate):
+            yield orderbook.limit()
+
+    async def stream_ticker(self, symbol: str, params={}, maxsize=1000):
+        async for ticker in self.stream_watch('watch_ticker', symbol, params, maxsize=maxsize):
+            yield ticker
+
+    async def stream_trades(self, symbol: str, since: Int = None, limit: Int = None, params={}, maxsize=1000):
+        async for trades in self.stream_watch('watch_trades', symbol, since, limit, params, maxsize=maxsize):
+            if self.newUpdates and isinstance(trades, BaseCache):
+                # the trades added to the cache since the previous update
+                count = trades.getLimit(symbol, None)
+                if count:
+                    yield trades[-count:]
+            else:
+                yield trades
+
     def on_connected(self, client, message=None):
         # for user hooks
         # print('Connected to', client.url)
         pass
 
     def on_error(self, client, error):
-        if client.url in self.clients and self.clients[client.url].error:
+        if client.reconnecting:
+            self.schedule_reconnect(client)
+        elif client.url in self.clients and self.clients[client.url].error:
             del self.clients[client.url]
 
     def on_close(self, client, error):
-        if client.error:
+        if client.reconnecting:
+            self.schedule_reconnect(client)
+        elif client.error:
             # connection closed by the user or due to an error
             pass
         else:
@@ -484,8 +916,69 @@ class Exchange(BaseExchange):
             if client.url in self.clients:
                 del self.clients[client.url]
 
+    def on_reconnected(self, client):
+        # called before the subscribe messages are replayed on the new connection, python only,
+        # the ts Client does not reconnect, so the overrides of the exchanges are not in their ts files
+        pass
+
+    def schedule_reconnect(self, client):
+        if client.reconnect_looper is not None or client.url not in self.clients:
+            return
+        delay = min(client.reconnectDelay * 2 ** client.reconnectAttempts, client.maxReconnectDelay)
+        # the jitter spreads the reconnects of the clients that dropped at the same time
+        delay = delay * (0.5 + random.random() / 2)
+        client.reconnectAttempts += 1
+        client.reconnect_looper = asyncio.ensure_future(self.reconnect_client(client, delay))
+
+    async def reconnect_client(self, client, delay):
+        await self.sleep(delay)
+        client.reconnect_looper = None
+        if not client.reconnecting or self.clients.get(client.url) is not client:
+            return
+        if client.verbose:
+            client.log(self.iso8601(self.milliseconds()), 'reconnecting to', client.url, 'attempt', client.reconnectAttempts)
+        for looper in (client.ping_looper, client.receive_looper):
+            if looper is not None:
+                looper.cancel()
+        client.connection = None
+        client.connecting = True
+        client.error = None
+        client.lastPong = None
+        # on failure, open() calls on_error and the next attempt is scheduled
+        await client.open(self.session)
+        if client.isConnected:
+            client.reconnecting = False
+            client.reconnectAttempts = 0
+            await self.resubscribe(client)
+
+    async def resubscribe(self, client):
+        self.on_reconnected(client)
+        options = self.safe_value(self.options, 'ws')
+        cost = self.safe_value(options, 'cost', 1)
+        messages = []
+        for subscribe_hash in list(client.subscribe_messages):
+            message = client.subscribe_messages[subscribe_hash]
+            # watch_multiple subscribes to several hashes with one message
+            if subscribe_hash in client.subscriptions and not any(message is sent for sent in messages):
+                messages.append(message)
+        for message in messages:
+            # the messages, and the snapshots requested after them, are spread by the rate limiter
+            if self.enableRateLimit:
+                await client.throttle(cost)
+            try:
+                await client.send(message)
+            except Exception as e:
+                client.on_error(e)
+                return
+
     async def ws_close(self):
         if self.clients:
+            for client in self.clients.values():
+                client.reconnect = False
+                client.reconnecting = False
+                if client.reconnect_looper is not None:
+                    client.reconnect_looper.cancel()
+                    client.reconnect_looper = None
             await asyncio.wait([asyncio.create_task(client.close()) for client in self.clients.values()], return_when=asyncio.ALL_COMPLETED)
             for url in self.clients.copy():
                 del self.clients[url]
@@ -805,6 +1298,9 @@ class Exchange(BaseExchange):
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config)
             await self.throttle(cost)
+        if isinstance(params, dict):
+            # the lane of rate_limiter_priority() is never sent to the exchange, even when it is not configured
+            params.pop('rateLimiterPriority', None)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
         self.last_request_headers = request['headers']
@@ -1,6 +1,9 @@
 import asyncio
 import collections
-from time import time
+import time
+
+# the loop runs the timers that are due within one tick of its clock right away, ~15.6ms on windows
+clock_resolution = time.get_clock_info('monotonic').resolution
 
 
 class Throttler:
@@ -8,43 +11,179 @@ class Throttler:
         self.loop = loop
         self.config = {
             'refillRate': 1.0,
-            'delay': 0.001,
+            'delay': 0.001,  # unused, the wakeup is scheduled for the exact time the tokens are available
             'cost': 1.0,
             'tokens': 0,
             'maxCapacity': 2000,
             'capacity': 1.0,
+            'priority': 0,  # the default lane, lower values are served first
         }
         self.config.update(config)
-        self.queue = collections.deque()
-        self.running = False
-
-    async def looper(self):
-        last_timestamp = time() * 1000
-        while self.running:
-            future, cost = self.queue[0]
-            cost = self.config['cost'] if cost is None else cost
+        self.refill_rate = self.config['refillRate']  # the static rate, restored when the quota runs out
+        self.queues = {}  # a queue for each priority lane that has waiting requests
+        self.queue_length = 0
+        self.running = False  # True while a wakeup is scheduled
+        self.timer = None
+        self.last_timestamp = None
+        self.statistics = {
+            'dispatched': 0,
+            'delayed': 0,
+            'totalWait': 0.0,
+            'maxWait': 0.0,
+            'maxQueueLength': 0,
+        }
+
+    def get_loop(self):
+        if self.loop is None:
+            return asyncio.get_event_loop()
+        return self.loop
+
+    def refill(self, now):
+        # tokens are refilled from the elapsed time instead of polling
+        if self.last_timestamp is not None and self.config['tokens'] < self.config['capacity']:
+            elapsed = now - self.last_timestamp
+            self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+        self.last_timestamp = now
+
+    def dispatch(self):
+        self.timer = None
+        loop = self.get_loop()
+        now = loop.time() * 1000
+        self.refill(now)
+        while self.queues and self.config['tokens'] >= 0:
+            # always serve the highest priority lane first
+            priority = min(self.queues)
+            queue = self.queues[priority]
+            future, cost, timestamp = queue.popleft()
+            if not queue:
+                del self.queues[priority]
+            self.queue_length -= 1
+            self.config['tokens'] -= cost
+            wait = now - timestamp
+            self.statistics['dispatched'] += 1
+            self.statistics['delayed'] += 1
+            self.statistics['totalWait'] += wait
+            self.statistics['maxWait'] = max(self.statistics['maxWait'], wait)
+            if not future.done():
+                future.set_result(None)
+        if self.queues:
+            self.schedule(loop)
+        else:
+            self.running = False
+
+    def schedule(self, loop):
+        # sleep once until enough tokens are refilled for the request at the head of the queue, for at least
+        # one clock tick, a float residue like -4e-16 tokens would otherwise wake up dispatch() again and again
+        # at the same instant, where nothing is refilled, until the clock moves
+        delay = max(-self.config['tokens'] / self.config['refillRate'] / 1000, clock_resolution)
+        self.running = True
+        self.timer = loop.call_at(loop.time() + delay, self.dispatch)
+
+    def update(self, remaining, reset):
+        # syncs the bucket with the quota reported by the server, remaining is in cost
+        # units and reset is the number of milliseconds until the quota is restored
+        loop = self.get_loop()
+        self.refill(loop.time() * 1000)
+        if remaining <= 0:
+            # wait for the reset, then continue at the static rate
+            self.config['refillRate'] = self.refill_rate
+            self.config['tokens'] = min(self.config['tokens'], -reset * self.refill_rate)
+        elif reset > 0:
+            # spread the remaining quota over the rest of the window
+            self.config['refillRate'] = remaining / reset
+            self.config['tokens'] = min(self.config['tokens'], remaining)
+        if self.timer is not None:
+            self.timer.cancel()
+            self.schedule(loop)
+
+    def stats(self):
+        dispatched = self.statistics['dispatched']
+        return {
+            'queueLength': self.queue_length,
+            'queueLengths': {priority: len(self.queues[priority]) for priority in self.queues},
+            'maxQueueLength': self.statistics['maxQueueLength'],
+            'tokens': self.config['tokens'],
+            'dispatched': dispatched,
+            'delayed': self.statistics['delayed'],
+            'averageWait': self.statistics['totalWait'] / dispatched if dispatched else 0.0,
+            'maxWait': self.statistics['maxWait'],
+        }
+
+    def __call__(self, cost=None, priority=None):
+        if isinstance(cost, tuple):
+            # (cost, priority) from Exchange.calculate_rate_limiter_request_cost
+            cost, priority = cost
+        loop = self.get_loop()
+        future = loop.create_future()
+        cost = self.config['cost'] if cost is None else cost
+        priority = self.config['priority'] if priority is None else priority
+        if self.queue_length > self.config['maxCapacity']:
+            raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
+        now = loop.time() * 1000
+        if not self.queues:
+            self.refill(now)
             if self.config['tokens'] >= 0:
+                # fast path, no need to queue and wake up later
                 self.config['tokens'] -= cost
-                if not future.done():
-                    future.set_result(None)
-                self.queue.popleft()
-                # context switch
-                await asyncio.sleep(0)
-                if len(self.queue) == 0:
-                    self.running = False
-            else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
-
-    def __call__(self, cost=None):
-        future = asyncio.Future()
-        if len(self.queue) > self.config['maxCapacity']:
-            raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
-        self.queue.append((future, cost))
+                self.statistics['dispatched'] += 1
+                future.set_result(None)
+                return future
+        if priority not in self.queues:
+            self.queues[priority] = collections.deque()
+        self.queues[priority].append((future, cost, now))
+        self.queue_length += 1
+        self.statistics['maxQueueLength'] = max(self.statistics['maxQueueLength'], self.queue_length)
         if not self.running:
-            self.running = True
-            asyncio.ensure_future(self.looper(), loop=self.loop)
+            self.schedule(loop)
         return future
+
+
+# -----------------------------------------------------------------------------
+# process-wide registry of named throttlers, every exchange instance or ws client
+# that resolves to the same name shares one token bucket and the configuration
+# of whoever created it first
+
+
+throttlers = {}
+
+
+def shared_throttler(name, config, loop=None):
+    if name not in throttlers:
+        throttlers[name] = Throttler(config, loop)
+    return throttlers[name]
+
+
+# -----------------------------------------------------------------------------
+# charges each request to several buckets, like the request weight and the order
+# count limits of binance, the cost is either a number for the default bucket
+# or a dict of costs by bucket name
+
+
+class MultiThrottler:
+    def __init__(self, throttlers, default='default'):
+        self.throttlers = throttlers
+        self.default = default
+
+    @property
+    def loop(self):
+        return self.throttlers[self.default].loop
+
+    @loop.setter
+    def loop(self, loop):
+        for name in self.throttlers:
+            self.throttlers[name].loop = loop
+
+    def update(self, remaining, reset):
+        self.throttlers[self.default].update(remaining, reset)
+
+    def stats(self):
+        return {name: self.throttlers[name].stats() for name in self.throttlers}
+
+    async def __call__(self, cost=None, priority=None):
+        if isinstance(cost, tuple):
+            cost, priority = cost
+        if isinstance(cost, dict):
+            for name in cost:
+                await self.throttlers[name](cost[name], priority)
+        else:
+            await self.throttlers[self.default](cost, priority)
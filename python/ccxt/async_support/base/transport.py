@@ -0,0 +1,46 @@
+from ccxt.base.errors import ExchangeError, ExchangeNotAvailable, NotSupported, RequestTimeout
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# -----------------------------------------------------------------------------
+# a transport sends the requests of Exchange.fetch() instead of the aiohttp session
+# request() returns the status code, the reason, the response headers, the body text and the raw body
+
+
+class HttpxTransport:
+    def __init__(self, id, ssl_context=True, trust_env=False, http2=True, limits={}):
+        if httpx is None:
+            raise NotSupported(id + ' - to use the http2 transport with ccxt, you need "httpx" module that can be installed by "pip install httpx[http2]"')
+        self.id = id
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            verify=ssl_context,
+            trust_env=trust_env,
+            limits=httpx.Limits(**limits),
+        )
+
+    async def request(self, method, url, headers, body, timeout):
+        details = ' '.join([self.id, method, url])
+        try:
+            response = await self.client.request(method, url, headers=headers, content=body, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise RequestTimeout(details) from e
+        except httpx.NetworkError as e:
+            raise ExchangeNotAvailable(details) from e
+        except httpx.HTTPError as e:
+            raise ExchangeError(details) from e
+        headers = {}
+        for name, value in response.headers.multi_items():
+            # http/2 header names are lowercase
+            name = '-'.join(part.capitalize() for part in name.split('-'))
+            if name in headers:
+                headers[name] = headers[name] + ', ' + value
+            else:
+                headers[name] = value
+        return response.status_code, response.reason_phrase, headers, response.text, response.content
+
+    async def close(self):
+        await self.client.aclose()
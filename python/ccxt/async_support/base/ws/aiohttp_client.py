@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import json
+from time import perf_counter
 from asyncio import sleep, ensure_future
 from aiohttp import WSMsgType
 from .functions import milliseconds, iso8601, is_json_encoded_object
@@ -21,12 +22,25 @@ class AiohttpClient(Client):
 
     # helper method for binary and text messages
     def handle_text_or_binary_message(self, data):
+        self.message_count += 1
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
-        if isinstance(data, bytes):
-            data = data.decode()
-        decoded = json.loads(data) if is_json_encoded_object(data) else data
-        self.on_message_callback(self, decoded)
+        if self.instrumentation:
+            started = perf_counter()
+        if is_json_encoded_object(data):
+            # decoded straight from the bytes of binary frames
+            decoded = self.json_loads(data)
+        elif isinstance(data, bytes):
+            decoded = data.decode()
+        else:
+            decoded = data
+        if self.instrumentation:
+            decoded_at = perf_counter()
+            self.histogram('decode').record((decoded_at - started) * 1000)
+            self.on_message_callback(self, decoded)
+            self.record_message(decoded, perf_counter(), decoded_at)
+        else:
+            self.on_message_callback(self, decoded)
 
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
@@ -93,6 +107,9 @@ class AiohttpClient(Client):
             self.ping_looper.cancel()
         if self.receive_looper:
             self.receive_looper.cancel()  # cancel all pending futures stored in self.futures
+        if self.reconnecting:
+            # the futures are resolved after the reconnect
+            return
         for key in self.futures:
             future = self.futures[key]
             if not future.done():
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from asyncio import sleep, ensure_future, wait_for, TimeoutError
+import json
+import time
+from asyncio import sleep, ensure_future, wait_for, TimeoutError, get_event_loop
 from .functions import milliseconds, iso8601, deep_extend
 from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.histogram import Histogram
 
 
 class Client(object):
@@ -14,6 +17,20 @@ class Client(object):
     options = {}  # ws-specific options
     subscriptions = {}
     rejections = {}
+    streams = {}  # message_hash -> [Stream]
+    fan_ins = {}  # tuple of message hashes -> FanIn
+    # message hash or message hash prefix -> milliseconds, the results of a conflated subscription
+    # are delivered at most once per interval, 0 delivers the latest one after a burst is handled
+    conflation = {}
+    conflated = {}  # message_hash -> the latest result that is not delivered yet
+    conflation_windows = {}  # message_hash -> TimerHandle of the open interval
+    conflated_messages = {}  # message_hash -> number of results replaced by a newer one
+    flush_scheduled = False
+    instrumentation = False  # record the ingest latency histograms
+    topicKeys = ['e', 'event', 'channel', 'topic', 'op', 'type']  # the first string value is the topic of a message
+    eventTimeKeys = ['E', 'ts', 'timestamp', 'time']  # the first number is the event time of a message in ms
+    histograms = {}  # 'queue', 'decode', 'exchangeLag' -> Histogram
+    handler_histograms = {}  # topic -> Histogram
     on_message_callback = None
     on_error_callback = None
     on_close_callback = None
@@ -34,10 +51,20 @@ class Client(object):
     gunzip = False
     inflate = False
     throttle = None
+    json_loads = staticmethod(json.loads)  # takes str or bytes
     connecting = False
+    message_count = 0  # since the connection was established
     asyncio_loop = None
     ping_looper = None
     receive_looper = None
+    reconnect = False  # reconnect after a network error and replay the subscribe messages, the futures stay pending
+    reconnectDelay = 500  # ms, doubled after every failed attempt, with a random jitter
+    maxReconnectDelay = 30000
+    maxReconnectAttempts = 10  # in a row, None for unlimited
+    reconnectAttempts = 0
+    reconnecting = False
+    reconnect_looper = None
+    subscribe_messages = {}  # subscribe_hash -> the message sent to subscribe
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
@@ -45,6 +72,15 @@ class Client(object):
             'futures': {},
             'subscriptions': {},
             'rejections': {},
+            'streams': {},
+            'fan_ins': {},
+            'conflation': {},
+            'conflated': {},
+            'conflation_windows': {},
+            'conflated_messages': {},
+            'histograms': {},
+            'handler_histograms': {},
+            'subscribe_messages': {},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
             'on_close_callback': on_close_callback,
@@ -73,14 +109,124 @@ class Client(object):
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
+        if self.conflation:
+            interval = self.conflation_interval(message_hash)
+            if interval is not None:
+                return self.conflate(result, message_hash, interval)
+        return self.deliver(result, message_hash)
+
+    def deliver(self, result, message_hash):
         if message_hash in self.futures:
             future = self.futures[message_hash]
             future.resolve(result)
             del self.futures[message_hash]
+        if message_hash in self.streams:
+            for stream in list(self.streams[message_hash]):
+                stream.put(result)
+        return result
+
+    def conflation_interval(self, message_hash):
+        if message_hash in self.conflation:
+            return self.conflation[message_hash]
+        if isinstance(message_hash, str):
+            for prefix in self.conflation:
+                if message_hash.startswith(prefix):
+                    return self.conflation[prefix]
+        return None
+
+    def conflate(self, result, message_hash, interval):
+        if message_hash in self.conflated:
+            self.conflated_messages[message_hash] = self.conflated_messages.get(message_hash, 0) + 1
+            self.conflated[message_hash] = result
+            return result
+        if interval:
+            if message_hash not in self.conflation_windows:
+                # the first result goes out right away and opens the interval
+                self.open_conflation_window(message_hash, interval)
+                return self.deliver(result, message_hash)
+        else:
+            self.schedule_flush()
+        self.conflated[message_hash] = result
         return result
 
+    def open_conflation_window(self, message_hash, interval):
+        loop = self.asyncio_loop or get_event_loop()
+        self.conflation_windows[message_hash] = loop.call_later(interval / 1000, self.close_conflation_window, message_hash, interval)
+
+    def close_conflation_window(self, message_hash, interval):
+        del self.conflation_windows[message_hash]
+        if message_hash in self.conflated:
+            # the latest result of the interval goes out and opens the next one
+            self.open_conflation_window(message_hash, interval)
+            self.deliver(self.conflated.pop(message_hash), message_hash)
+
+    def schedule_flush(self):
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            loop = self.asyncio_loop or get_event_loop()
+            loop.call_soon(self.flush_conflated)
+
+    def flush_conflated(self):
+        self.flush_scheduled = False
+        for message_hash in list(self.conflated):
+            if message_hash not in self.conflation_windows:
+                self.deliver(self.conflated.pop(message_hash), message_hash)
+
+    def message_rate(self):
+        # messages per second since the connection was established
+        if not self.connectionEstablished:
+            return 0.0
+        elapsed = milliseconds() - self.connectionEstablished
+        return self.message_count * 1000 / elapsed if elapsed > 0 else 0.0
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def message_topic(self, message):
+        if isinstance(message, list) and message:
+            message = message[0]
+        if isinstance(message, dict):
+            for key in self.topicKeys:
+                value = message.get(key)
+                if isinstance(value, str):
+                    return value
+        return 'unknown'
+
+    def message_event_time(self, message):
+        if isinstance(message, list) and message:
+            message = message[0]
+        if isinstance(message, dict):
+            for key in self.eventTimeKeys:
+                value = message.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    return value
+        return None
+
+    def record_message(self, message, handled, started):
+        # handled and started are perf_counter() values around the on_message_callback
+        topic = self.message_topic(message)
+        if topic not in self.handler_histograms:
+            self.handler_histograms[topic] = Histogram()
+        self.handler_histograms[topic].record((handled - started) * 1000)
+        event_time = self.message_event_time(message)
+        if event_time is not None:
+            self.histogram('exchangeLag').record(time.time() * 1000 - event_time)
+
+    def stats(self):
+        return {
+            'latency': {name: self.histograms[name].summary() for name in self.histograms},
+            'handlers': {topic: self.handler_histograms[topic].summary() for topic in self.handler_histograms},
+            'conflated': dict(self.conflated_messages),
+        }
+
     def reject(self, result, message_hash=None):
         if message_hash:
+            self.conflated.pop(message_hash, None)
+            if message_hash in self.streams:
+                for stream in list(self.streams[message_hash]):
+                    stream.fail(result)
             if message_hash in self.futures:
                 future = self.futures[message_hash]
                 future.reject(result)
@@ -91,6 +237,9 @@ class Client(object):
             message_hashes = list(self.futures.keys())
             for message_hash in message_hashes:
                 self.reject(result, message_hash)
+            for message_hash in list(self.streams.keys()):
+                for stream in list(self.streams.get(message_hash, [])):
+                    stream.fail(result)
         return result
 
     async def receive_loop(self):
@@ -119,6 +268,7 @@ class Client(object):
             self.connection = await wait_for(coroutine, timeout=int(self.connectionTimeout / 1000))
             self.connecting = False
             self.connectionEstablished = milliseconds()
+            self.message_count = 0
             self.isConnected = True
             if self.verbose:
                 self.log(iso8601(milliseconds()), 'connected')
@@ -150,7 +300,11 @@ class Client(object):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_error', error)
         self.error = error
-        self.reset(error)
+        if self.can_reconnect():
+            self.start_reconnecting()
+        else:
+            self.reconnecting = False
+            self.reset(error)
         self.on_error_callback(self, error)
         if not self.closed():
             ensure_future(self.close(1006), loop=self.asyncio_loop)
@@ -159,14 +313,37 @@ class Client(object):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'on_close', code)
         if not self.error:
-            self.reset(NetworkError('Connection closed by remote server, closing code ' + str(code)))
+            error = NetworkError('Connection closed by remote server, closing code ' + str(code))
+            if self.can_reconnect():
+                self.error = error
+                self.start_reconnecting()
+            else:
+                self.reset(error)
         self.on_close_callback(self, code)
         if not self.closed():
             ensure_future(self.close(code), loop=self.asyncio_loop)
 
+    def can_reconnect(self):
+        return self.reconnect and (self.maxReconnectAttempts is None or self.reconnectAttempts < self.maxReconnectAttempts)
+
+    def start_reconnecting(self):
+        # the pending futures are kept, new subscriptions wait for the next connection
+        self.reconnecting = True
+        self.isConnected = False
+        if self.connected.done():
+            self.connected = Future()
+        self.reset_connection()
+
     def reset(self, error):
+        self.reset_connection()
         self.reject(error)
 
+    def reset_connection(self):
+        for message_hash in self.conflation_windows:
+            self.conflation_windows[message_hash].cancel()
+        self.conflation_windows = {}
+        self.conflated = {}
+
     async def ping_loop(self):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'ping loop')
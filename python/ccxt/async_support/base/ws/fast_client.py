@@ -3,27 +3,93 @@
 import asyncio
 import socket
 import collections
+from aiohttp import WSMsgType
+from ccxt import NetworkError
 from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient
 
 
 class FastClient(AiohttpClient):
     transport = None
+    _close_code = None  # set by close(), None when the server drops the connection
+    highWaterMark = None  # max number of received messages waiting to be handled, None for unbounded
+    lowWaterMark = None  # resume reading below this number of messages, half the highWaterMark by default
+    overflowPolicy = 'pause'  # 'pause' reading from the socket, 'dropOldest' message or 'raise' a NetworkError
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         super(FastClient, self).__init__(url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config)
         # instead of using the deque in aiohttp we implement our own for speed
         # https://github.com/aio-libs/aiohttp/blob/1d296d549050aa335ef542421b8b7dad788246d5/aiohttp/streams.py#L534
-        self.stack = collections.deque()
+        self.stack = collections.deque()  # (message, received time in seconds of the event loop)
         self.callback_scheduled = False
+        self.paused = False
+        self.stack_stats = {
+            'maxDepth': 0,
+            'dropped': 0,
+            'pauses': 0,
+            'handled': 0,
+            'lag': 0.0,  # ms the last handled message waited in the stack
+            'maxLag': 0.0,
+        }
+
+    def handle_stacked_message(self):
+        message, received = self.stack.popleft()
+        lag = (self.asyncio_loop.time() - received) * 1000
+        stats = self.stack_stats
+        stats['handled'] += 1
+        stats['lag'] = lag
+        if lag > stats['maxLag']:
+            stats['maxLag'] = lag
+        if self.instrumentation:
+            self.histogram('queue').record(lag)
+        if self.paused and len(self.stack) <= self.low_water_mark():
+            self.paused = False
+            self.transport.resume_reading()
+        self.handle_message(message)
+
+    def low_water_mark(self):
+        if self.lowWaterMark is None:
+            return self.highWaterMark // 2
+        return self.lowWaterMark
+
+    def overflow(self):
+        # returns False if the new message is discarded
+        if self.overflowPolicy == 'dropOldest':
+            # control frames are never dropped
+            if self.stack[0][0].type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                self.stack.popleft()
+                self.stack_stats['dropped'] += 1
+        elif self.overflowPolicy == 'pause':
+            if not self.paused:
+                self.paused = True
+                self.stack_stats['pauses'] += 1
+                self.transport.pause_reading()
+        else:
+            self.on_error(NetworkError('connection to ' + self.url + ' has ' + str(len(self.stack)) + ' messages waiting to be handled, over the highWaterMark of ' + str(self.highWaterMark)))
+            return False
+        return True
+
+    def queue_stats(self):
+        stats = {
+            'depth': len(self.stack),
+            'paused': self.paused,
+        }
+        stats.update(self.stack_stats)
+        return stats
+
+    def stats(self):
+        stats = super(FastClient, self).stats()
+        stats['stack'] = self.queue_stats()
+        return stats
 
     def receive_loop(self):
         def handler():
             if not self.stack:
                 self.callback_scheduled = False
+                if self.flush_scheduled:
+                    self.flush_conflated()
                 return
-            message = self.stack.popleft()
             try:
-                self.handle_message(message)
+                self.handle_stacked_message()
             except Exception as error:
                 self.reject(error)
             self.asyncio_loop.call_soon(handler)
@@ -32,18 +98,22 @@ class FastClient(AiohttpClient):
             if not self.callback_scheduled:
                 self.callback_scheduled = True
                 self.asyncio_loop.call_soon(handler)
-            self.stack.append(message)
+            if self.highWaterMark is not None and len(self.stack) >= self.highWaterMark and not self.overflow():
+                return
+            self.stack.append((message, self.asyncio_loop.time()))
+            if len(self.stack) > self.stack_stats['maxDepth']:
+                self.stack_stats['maxDepth'] = len(self.stack)
 
         def feed_eof():
             if self._close_code == 1000:  # OK close
                 self.on_close(1000)
             else:
-                self.on_error(1006)  # ABNORMAL_CLOSURE
+                self.on_error(NetworkError('Connection to ' + self.url + ' closed abnormally, closing code 1006'))  # ABNORMAL_CLOSURE
 
         def wrapper(func):
             def parse_frame(buf):
                 while self.stack:
-                    self.handle_message(self.stack.popleft())
+                    self.handle_stacked_message()
                 return func(buf)
             return parse_frame
 
@@ -66,6 +136,7 @@ class FastClient(AiohttpClient):
                 except Exception as exc:
                     _self._close_code = 1006
                     _self._exception = exc
+                    _self._response.close()
             return True
 
         connection = self.connection._conn
@@ -89,8 +160,16 @@ class FastClient(AiohttpClient):
         # return a future so super class won't complain
         return asyncio.sleep(0)
 
-    def reset(self, error):
-        super(FastClient, self).reset(error)
+    def schedule_flush(self):
+        if self.callback_scheduled:
+            # the handler delivers the conflated results once the stack is drained
+            self.flush_scheduled = True
+        else:
+            super(FastClient, self).schedule_flush()
+
+    def reset_connection(self):
+        super(FastClient, self).reset_connection()
         self.stack.clear()
+        self.paused = False
         if self.transport:
             self.transport.abort()
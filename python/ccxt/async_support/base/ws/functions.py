@@ -41,6 +41,8 @@ def iso8601(timestamp=None):
 
 
 def is_json_encoded_object(input):
+    if isinstance(input, bytes):
+        return (len(input) >= 2) and ((input[0] == 123) or (input[0] == 91))  # { or [
     return (isinstance(input, str) and
             (len(input) >= 2) and
             ((input[0] == '{') or (input[0] == '[')))
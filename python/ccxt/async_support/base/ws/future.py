@@ -17,44 +17,71 @@ class Future(asyncio.Future):
     @classmethod
     def race(cls, futures):
         future = Future()
-        for f in futures:
-            f.is_race_future = True
-        coro = asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
-        task = asyncio.create_task(coro)
 
         def callback(done):
+            if future.done():
+                return
+            if done.cancelled():
+                # was canceled internally
+                if all(f.cancelled() for f in futures):
+                    future.set_exception(ExchangeClosedByUser('Connection closed by the user'))
+                return
+            for f in futures:
+                f.remove_done_callback(callback)
             exception = done.exception()
-            if exception is None:
-                complete, _ = done.result()
-                # check for exceptions
-                exceptions = []
-                for f in complete:
-                    if f._state == 'CANCELLED':
-                        continue  # was canceled internally
-                    err = f.exception()
-                    if err:
-                        exceptions.append(err)
-                # if any exceptions return with first exception
-                if len (exceptions) > 0:
-                    future.set_exception(exceptions[0])
-                    return
-                # else return first result
-                else:
-                    futures_list = list(complete)
-                    are_all_canceled = all(f._state == 'CANCELLED' for f in futures_list)
-                    if are_all_canceled and future._state == 'PENDING':
-                        future.set_exception(ExchangeClosedByUser('Connection closed by the user'))
-                        return
-
-                    # handle wait_for scenario
-                    if are_all_canceled and future._state == 'CANCELLED':
-                        return
-
-                    first = futures_list[0]
-
-                    first_result = first.result()
-                    future.set_result(first_result)
-            else:
+            if exception is not None:
                 future.set_exception(exception)
-        task.add_done_callback(callback)
+            else:
+                future.set_result(done.result())
+
+        for f in futures:
+            f.is_race_future = True
+            f.add_done_callback(callback)
         return future
+
+
+class FanIn:
+    """
+    resolves with the first result of the futures of a set of message hashes
+    the done-callbacks stay registered on the pending futures between the calls,
+    only the futures that were resolved since the previous call are replaced
+    """
+
+    def __init__(self, client, message_hashes):
+        self.client = client
+        self.members = {}
+        self.stale = list(message_hashes)
+        self.future = None
+
+    def wait(self):
+        if self.future is None or self.future.done():
+            self.future = Future()
+        stale = self.stale
+        self.stale = []
+        for message_hash in stale:
+            member = self.client.future(message_hash)
+            member.is_race_future = True
+            self.members[message_hash] = member
+            member.add_done_callback(self.callback(message_hash))
+        # concurrent callers share the future, one of them timing out must not cancel it for the others
+        return asyncio.shield(self.future)
+
+    def callback(self, message_hash):
+        def on_done(member):
+            if self.members.get(message_hash) is member:
+                del self.members[message_hash]
+                self.stale.append(message_hash)
+            future = self.future
+            if future is None or future.done():
+                return
+            if member.cancelled():
+                # all of them are canceled when the connection is closed by the user
+                if not self.members:
+                    future.set_exception(ExchangeClosedByUser('Connection closed by the user'))
+                return
+            exception = member.exception()
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(member.result())
+        return on_done
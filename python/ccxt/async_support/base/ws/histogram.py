@@ -0,0 +1,84 @@
+import bisect
+import re
+
+# upper bounds of the buckets in milliseconds, the last bucket counts everything above
+default_bounds = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in milliseconds, recording is one bisect and a few additions"""
+
+    def __init__(self, bounds=default_bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percentile):
+        # the upper bound of the bucket that holds the percentile, or the max for the last bucket
+        if not self.count:
+            return None
+        rank = percentile / 100 * self.count
+        seen = 0
+        for i in range(len(self.bounds)):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(self.bounds[i], self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count if self.count else None,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+def prometheus_name(name):
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+
+def prometheus_labels(labels):
+    return ','.join(key + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"' for key, value in labels.items())
+
+
+def prometheus_text(name, help, series):
+    """Prometheus text exposition of one histogram metric, series is a list of (labels, Histogram)"""
+    lines = [
+        '# HELP ' + name + ' ' + help,
+        '# TYPE ' + name + ' histogram',
+    ]
+    for labels, histogram in series:
+        label_text = prometheus_labels(labels)
+        prefix = label_text + ',' if label_text else ''
+        cumulative = 0
+        for i in range(len(histogram.bounds)):
+            cumulative += histogram.counts[i]
+            lines.append(name + '_bucket{' + prefix + 'le="' + str(histogram.bounds[i]) + '"} ' + str(cumulative))
+        lines.append(name + '_bucket{' + prefix + 'le="+Inf"} ' + str(histogram.count))
+        suffix = '{' + label_text + '}' if label_text else ''
+        lines.append(name + '_sum' + suffix + ' ' + repr(histogram.sum))
+        lines.append(name + '_count' + suffix + ' ' + str(histogram.count))
+    return '\n'.join(lines) + '\n'
+
+
+def prometheus_counter_text(name, help, series):
+    """Prometheus text exposition of one counter metric, series is a list of (labels, value)"""
+    lines = [
+        '# HELP ' + name + ' ' + help,
+        '# TYPE ' + name + ' counter',
+    ]
+    for labels, value in series:
+        lines.append(name + '{' + prometheus_labels(labels) + '} ' + str(value))
+    return '\n'.join(lines) + '\n'
@@ -33,14 +33,8 @@ class OrderBook(dict):
         return self
 
     def reset(self, snapshot={}):
-        self['asks']._index.clear()
-        self['asks'].clear()
-        for ask in snapshot.get('asks', []):
-            self['asks'].storeArray(ask)
-        self['bids']._index.clear()
-        self['bids'].clear()
-        for bid in snapshot.get('bids', []):
-            self['bids'].storeArray(bid)
+        self['asks'].load(snapshot.get('asks', []))
+        self['bids'].load(snapshot.get('bids', []))
         self['nonce'] = snapshot.get('nonce')
         self['timestamp'] = snapshot.get('timestamp')
         self['datetime'] = Exchange.iso8601(self['timestamp'])
@@ -76,3 +70,40 @@ class IndexedOrderBook(OrderBook):
             'bids': order_book_side.IndexedBids(snapshot.get('bids', []), depth),
         })
         super(IndexedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# indexed by order ids with a queue of orders per price level, see QueuedOrderBookSide
+
+
+class QueuedOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.QueuedAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.QueuedBids(snapshot.get('bids', []), depth),
+        })
+        super(QueuedOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# price levels are kept in float arrays, see ArrayOrderBookSide
+
+
+class ArrayOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.ArrayAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.ArrayBids(snapshot.get('bids', []), depth),
+        })
+        super(ArrayOrderBook, self).__init__(copy, depth)
+
+# -----------------------------------------------------------------------------
+# price levels are kept in float arrays and only copied into the bids and asks
+# lists when they are read, see LazyArrayOrderBookSide
+
+
+class LazyOrderBook(OrderBook):
+    def __init__(self, snapshot={}, depth=None):
+        copy = Exchange.extend(snapshot, {
+            'asks': order_book_side.LazyAsks(snapshot.get('asks', []), depth),
+            'bids': order_book_side.LazyBids(snapshot.get('bids', []), depth),
+        })
+        super(LazyOrderBook, self).__init__(copy, depth)
@@ -2,6 +2,9 @@
 
 import sys
 import bisect
+import operator
+from array import array
+from itertools import islice
 
 """Author: Carlo Revelli"""
 """Fast bisect bindings"""
@@ -9,6 +12,10 @@ import bisect
 """Performs a binary search when inserting keys in sorted order"""
 
 
+def is_strictly_increasing(keys):
+    return all(map(operator.lt, keys, islice(keys, 1, None)))
+
+
 class OrderBookSide(list):
     side = None  # set to True for bids and False for asks
 
@@ -18,8 +25,8 @@ class OrderBookSide(list):
         self._n = sys.maxsize
         # parallel to self
         self._index = []
-        for delta in deltas:
-            self.storeArray(list(delta))
+        if deltas:
+            self.load([list(delta) for delta in deltas])
 
     def storeArray(self, delta):
         price = delta[0]
@@ -39,6 +46,34 @@ class OrderBookSide(list):
     def store(self, price, size):
         self.storeArray([price, size])
 
+    def load(self, deltas):
+        # replaces the side with a snapshot in one pass, the result is the same as
+        # storing the deltas one by one into an empty side, the snapshot is sorted
+        # only if it is out of order or has duplicate prices or empty levels
+        self.clear()
+        if not isinstance(deltas, list):
+            deltas = list(deltas)
+        keys = self.sort_keys(deltas)
+        if not is_strictly_increasing(keys) or not all(map(self.is_level, deltas)):
+            levels = {}
+            for key, delta in zip(keys, deltas):
+                if self.is_level(delta):
+                    levels[key] = delta
+                else:
+                    levels.pop(key, None)
+            keys = sorted(levels)
+            deltas = [levels[key] for key in keys]
+        self._index.extend(keys)
+        list.extend(self, deltas)
+
+    def sort_keys(self, deltas):
+        if self.side:
+            return [-delta[0] for delta in deltas]
+        return [delta[0] for delta in deltas]
+
+    def is_level(self, delta):
+        return bool(delta[1])
+
     def limit(self):
         difference = len(self) - self._depth
         for _ in range(difference):
@@ -48,6 +83,10 @@ class OrderBookSide(list):
     def remove_index(self, order):
         pass
 
+    def clear(self):
+        super(OrderBookSide, self).clear()
+        self._index.clear()
+
     def __len__(self):
         length = super(OrderBookSide, self).__len__()
         return min(length, self._n)
@@ -97,6 +136,9 @@ class CountedOrderBookSide(OrderBookSide):
     def store(self, price, size, count):
         self.storeArray([price, size, count])
 
+    def is_level(self, delta):
+        return bool(delta[1] and delta[2])
+
 # -----------------------------------------------------------------------------
 # indexed by order ids (3rd value in a bidask delta)
 
@@ -157,9 +199,325 @@ class IndexedOrderBookSide(OrderBookSide):
         if order_id in self._hashmap:
             del self._hashmap[order_id]
 
+    def clear(self):
+        super(IndexedOrderBookSide, self).clear()
+        self._hashmap.clear()
+
     def store(self, price, size, order_id):
         self.storeArray([price, size, order_id])
 
+    def load(self, deltas):
+        # orders at the same price are sorted by order id like storeArray does
+        self.clear()
+        if not isinstance(deltas, list):
+            deltas = list(deltas)
+        keys = self.sort_keys(deltas)
+        ordered = len(set(delta[2] for delta in deltas)) == len(deltas) and all(key[0] is not None for key in keys)
+        if not ordered or not is_strictly_increasing(keys) or not all(map(self.is_level, deltas)):
+            # a later delta of the same order id moves or removes it
+            orders = {}
+            for key, delta in zip(keys, deltas):
+                order_id = delta[2]
+                if not delta[1]:
+                    orders.pop(order_id, None)
+                elif key[0] is None:
+                    if order_id in orders:
+                        key = orders[order_id][0]
+                        delta[0] = abs(key[0])
+                        orders[order_id] = (key, delta)
+                else:
+                    orders[order_id] = (key, delta)
+            levels = sorted(orders.values(), key=operator.itemgetter(0))
+            keys = [key for key, delta in levels]
+            deltas = [delta for key, delta in levels]
+        self._index.extend(key[0] for key in keys)
+        list.extend(self, deltas)
+        self._hashmap.update((key[1], key[0]) for key in keys)
+
+    def sort_keys(self, deltas):
+        if self.side:
+            return [(None if delta[0] is None else -delta[0], delta[2]) for delta in deltas]
+        return [(delta[0], delta[2]) for delta in deltas]
+
+# -----------------------------------------------------------------------------
+# an l3 side indexed by order ids (3rd value in a bidask delta) for feeds with many
+# orders per price, every price level is a queue of orders in arrival order, a
+# dict keyed by order id, so an update or a cancel of a known order is a couple
+# of dict operations and only a new price level costs a bisect into the prices
+# the queues hold the whole side, the depth only bounds the orders exposed
+# through the list, which is rebuilt from the first changed price when read
+
+
+class QueuedOrderBookSide(OrderBookSide):
+    def __init__(self, deltas=[], depth=None):
+        # index price -> {order_id: delta}
+        self._levels = {}
+        # order_id -> index price
+        self._hashmap = {}
+        # index prices of the orders stored in self
+        self._stored_index = []
+        # the lowest index price changed since the orders were stored in self
+        self._changed = None
+        # self._index holds the sorted index prices of the levels
+        super(QueuedOrderBookSide, self).__init__(deltas, depth)
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        order_id = delta[2]
+        old_price = self._hashmap.get(order_id)
+        if size:
+            if price:
+                index_price = -price if self.side else price
+            elif old_price is None:
+                return
+            else:
+                # in case the price is not defined
+                index_price = old_price
+                delta[0] = -index_price if self.side else index_price
+            if index_price == old_price:
+                # keeps its place in the queue
+                self._levels[index_price][order_id] = delta
+            else:
+                if old_price is not None:
+                    self.remove_order(order_id, old_price)
+                level = self._levels.get(index_price)
+                if level is None:
+                    level = self._levels[index_price] = {}
+                    bisect.insort(self._index, index_price)
+                level[order_id] = delta
+                self._hashmap[order_id] = index_price
+            self.mark_changed(index_price)
+        elif old_price is not None:
+            self.remove_order(order_id, old_price)
+            del self._hashmap[order_id]
+
+    def remove_order(self, order_id, index_price):
+        level = self._levels[index_price]
+        del level[order_id]
+        if not level:
+            del self._levels[index_price]
+            del self._index[bisect.bisect_left(self._index, index_price)]
+        self.mark_changed(index_price)
+
+    def mark_changed(self, index_price):
+        if self._changed is None or index_price < self._changed:
+            self._changed = index_price
+
+    def load(self, deltas):
+        # the orders of a snapshot are queued in the order they are listed
+        self.clear()
+        for delta in deltas:
+            self.storeArray(delta)
+
+    def store(self, price, size, order_id):
+        self.storeArray([price, size, order_id])
+
+    def limit(self):
+        self.materialize()
+
+    def materialize(self, count=None):
+        # brings the first count orders (all of them by default) in sync with the queues
+        stored = list.__len__(self)
+        length = min(len(self._hashmap), self._depth)
+        target = length if count is None else min(count, length)
+        if self._changed is not None:
+            if stored:
+                stored = bisect.bisect_left(self._stored_index, self._changed)
+                list.__delitem__(self, slice(stored, None))
+                del self._stored_index[stored:]
+            self._changed = None
+        if stored > length:
+            list.__delitem__(self, slice(length, None))
+            del self._stored_index[length:]
+        elif stored < target:
+            position = 0
+            if stored:
+                last = self._stored_index[-1]
+                position = bisect.bisect_left(self._index, last)
+                start = bisect.bisect_left(self._stored_index, last)
+                if stored - start < len(self._levels[last]):
+                    # the last level is partially stored, so it is copied again
+                    list.__delitem__(self, slice(start, None))
+                    del self._stored_index[start:]
+                    stored = start
+                else:
+                    position += 1
+            prices = self._index
+            while stored < target:
+                index_price = prices[position]
+                orders = list(islice(self._levels[index_price].values(), target - stored))
+                self.extend(orders)
+                self._stored_index.extend([index_price] * len(orders))
+                stored += len(orders)
+                position += 1
+
+    def clear(self):
+        list.clear(self)
+        self._index.clear()
+        self._levels.clear()
+        self._hashmap.clear()
+        self._stored_index.clear()
+        self._changed = None
+
+    def __len__(self):
+        return min(len(self._hashmap), self._depth, self._n)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:
+                self.materialize(stop)
+                return list.__getitem__(self, slice(start, stop))
+            self.materialize()
+        else:
+            self.materialize(item + 1 if item >= 0 else None)
+        return list.__getitem__(self, item)
+
+    def __iter__(self):
+        self.materialize()
+        return list.__iter__(self)
+
+# -----------------------------------------------------------------------------
+# stores prices and sizes in two contiguous float arrays instead of a list of lists
+# a lookup is a bisect over the price array, a size update is done in place and
+# inserts and deletes shift raw doubles without allocating python objects
+# the arrays hold the whole side, the depth only bounds the [price, size] levels
+# exposed through the list, changes are replayed onto those levels when read
+
+
+class ArrayOrderBookSide(OrderBookSide):
+    def __init__(self, deltas=[], depth=None):
+        super(ArrayOrderBookSide, self).__init__([], depth)
+        # parallel float arrays, prices are negated for bids like in self._index
+        self._index = array('d')
+        self._sizes = array('d')
+        # (index, price, size, exists) changes not yet applied to the levels stored in self
+        self._pending = []
+        # how many levels self holds once the pending changes are applied
+        self._stored = 0
+        if deltas:
+            self.load(deltas)
+
+    def storeArray(self, delta):
+        price = delta[0]
+        size = delta[1]
+        index_price = -price if self.side else price
+        index = bisect.bisect_left(self._index, index_price)
+        exists = index < len(self._index) and self._index[index] == index_price
+        if size:
+            if exists:
+                self._sizes[index] = size
+            else:
+                self._index.insert(index, index_price)
+                self._sizes.insert(index, size)
+        elif exists:
+            del self._index[index]
+            del self._sizes[index]
+        else:
+            return
+        if index < self._stored:
+            self._pending.append((index, price, size, exists))
+            if not exists:
+                self._stored += 1
+            elif not size:
+                self._stored -= 1
+            if len(self._pending) > self._stored:
+                # cheaper to rebuild the levels than to replay every change
+                self._pending.clear()
+                self._stored = 0
+                list.clear(self)
+
+    def load(self, deltas):
+        # fills the arrays directly, the levels are built when they are read
+        self.clear()
+        if not isinstance(deltas, list):
+            deltas = list(deltas)
+        keys = self.sort_keys(deltas)
+        if is_strictly_increasing(keys) and all(map(self.is_level, deltas)):
+            self._index.fromlist(keys)
+            self._sizes.fromlist([delta[1] for delta in deltas])
+        else:
+            levels = {}
+            for key, delta in zip(keys, deltas):
+                if delta[1]:
+                    levels[key] = delta[1]
+                else:
+                    levels.pop(key, None)
+            keys = sorted(levels)
+            self._index.fromlist(keys)
+            self._sizes.fromlist([levels[key] for key in keys])
+
+    def limit(self):
+        self.materialize()
+
+    def materialize(self, count=None):
+        # brings the first count levels (all of them by default) in sync with the arrays
+        if self._pending:
+            for index, price, size, exists in self._pending:
+                if not exists:
+                    list.insert(self, index, [price, size])
+                elif size:
+                    list.__getitem__(self, index)[1] = size
+                else:
+                    list.__delitem__(self, index)
+            self._pending.clear()
+        stored = self._stored
+        length = min(len(self._index), self._depth)
+        target = length if count is None else min(count, length)
+        if stored > length:
+            list.__delitem__(self, slice(length, None))
+            stored = length
+        elif stored < target:
+            prices = self._index[stored:target]
+            sizes = self._sizes[stored:target]
+            if self.side:
+                self.extend([[-price, size] for price, size in zip(prices, sizes)])
+            else:
+                self.extend([[price, size] for price, size in zip(prices, sizes)])
+            stored = target
+        self._stored = stored
+
+    def clear(self):
+        list.clear(self)
+        del self._index[:]
+        del self._sizes[:]
+        self._pending.clear()
+        self._stored = 0
+
+    def __len__(self):
+        return min(len(self._index), self._depth, self._n)
+
+    def __getitem__(self, item):
+        self.materialize()
+        return list.__getitem__(self, item)
+
+    def __iter__(self):
+        self.materialize()
+        return list.__iter__(self)
+
+# -----------------------------------------------------------------------------
+# an array side that copies nothing on limit() and only builds the levels that are read
+# reading side[0] after every update costs one level no matter how deep the side is
+# the levels beyond the ones read are not stored in the underlying list, so use
+# list(side) or side[:] to get a plain copy before passing it to json or other c code
+
+
+class LazyArrayOrderBookSide(ArrayOrderBookSide):
+    def limit(self):
+        pass
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:
+                self.materialize(stop)
+                return list.__getitem__(self, slice(start, stop))
+            self.materialize()
+        else:
+            self.materialize(item + 1 if item >= 0 else None)
+        return list.__getitem__(self, item)
+
 # -----------------------------------------------------------------------------
 # a more elegant syntax is possible here, but native inheritance is portable
 
@@ -169,3 +527,9 @@ class CountedAsks(CountedOrderBookSide): side = False                       # no
 class CountedBids(CountedOrderBookSide): side = True                        # noqa
 class IndexedAsks(IndexedOrderBookSide): side = False                       # noqa
 class IndexedBids(IndexedOrderBookSide): side = True                        # noqa
+class QueuedAsks(QueuedOrderBookSide): side = False                         # noqa
+class QueuedBids(QueuedOrderBookSide): side = True                          # noqa
+class ArrayAsks(ArrayOrderBookSide): side = False                           # noqa
+class ArrayBids(ArrayOrderBookSide): side = True                            # noqa
+class LazyAsks(LazyArrayOrderBookSide): side = False                        # noqa
+class LazyBids(LazyArrayOrderBookSide): side = True                         # noqa
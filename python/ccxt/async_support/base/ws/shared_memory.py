@@ -0,0 +1,257 @@
+"""Order books and tickers maintained by worker processes and published in shared memory"""
+
+import asyncio
+import json
+import math
+import multiprocessing
+import struct
+from multiprocessing import shared_memory
+
+# -----------------------------------------------------------------------------
+# segment layout, all numbers are little-endian and every slot is 8-byte aligned
+#
+#     magic (8 bytes) | directory length (uint64) | directory json, padded to 8 bytes
+#     order book slots, one per symbol of directory['orderbooks']
+#     ticker slots, one per symbol of directory['tickers']
+#
+# each slot starts with a sequence number, a seqlock: the single writer makes it odd
+# before and even after an update, readers retry until they copy a slot with the
+# same even sequence number before and after, so neither side ever takes a lock
+
+magic = b'CCXTSHM1'
+preamble = struct.Struct('<8sQ')
+sequence = struct.Struct('<Q')
+# sequence, timestamp, nonce, number of bids, number of asks
+order_book_header = struct.Struct('<QqqII')
+order_book_fields = struct.Struct('<qqII')
+ticker_fields = ['timestamp', 'bid', 'bidVolume', 'ask', 'askVolume', 'open', 'high', 'low', 'last', 'baseVolume', 'quoteVolume']
+ticker_values = struct.Struct('<' + 'd' * len(ticker_fields))
+ticker_struct = struct.Struct('<Q' + 'd' * len(ticker_fields))
+missing = -(2 ** 63)  # timestamp or nonce that is None
+
+
+created = set()  # the names of the segments created by this process
+
+
+def attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        memory = shared_memory.SharedMemory(name)
+        if name not in created and multiprocessing.parent_process() is None:
+            # before python 3.13 the resource tracker of an unrelated process
+            # would unlink the segment when that process exits
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, 'shared_memory')
+        return memory
+
+
+class SharedSegment:
+    """The order books and tickers of one worker, created by SharedMemoryRunner and attached by name"""
+
+    def __init__(self, name, orderbooks=[], tickers=[], depth=20, create=False):
+        if create:
+            directory = json.dumps({'orderbooks': list(orderbooks), 'tickers': list(tickers), 'depth': depth}).encode()
+            directory += b' ' * (-len(directory) % 8)
+        else:
+            self.memory = attach_shared_memory(name)
+            prefix, length = preamble.unpack_from(self.memory.buf, 0)
+            if prefix != magic:
+                self.close()
+                raise ValueError('shared memory ' + name + ' is not a ccxt segment')
+            directory = bytes(self.memory.buf[preamble.size:preamble.size + length])
+            decoded = json.loads(directory)
+            orderbooks, tickers, depth = decoded['orderbooks'], decoded['tickers'], decoded['depth']
+        self.depth = depth
+        self.levels = struct.Struct('<' + 'd' * (4 * depth))  # bids, then asks, as price, amount pairs
+        self.order_book_size = order_book_header.size + self.levels.size
+        offset = preamble.size + len(directory)
+        self.orderbooks = {}
+        for symbol in orderbooks:
+            self.orderbooks[symbol] = offset
+            offset += self.order_book_size
+        self.tickers = {}
+        for symbol in tickers:
+            self.tickers[symbol] = offset
+            offset += ticker_struct.size
+        if create:
+            self.memory = shared_memory.SharedMemory(name, create=True, size=offset)
+            created.add(self.memory.name)
+            self.memory.buf[:offset] = bytes(offset)
+            preamble.pack_into(self.memory.buf, 0, magic, len(directory))
+            self.memory.buf[preamble.size:preamble.size + len(directory)] = directory
+        self.name = self.memory.name
+
+    def write_order_book(self, symbol, orderbook):
+        offset = self.orderbooks[symbol]
+        buf = self.memory.buf
+        seq = sequence.unpack_from(buf, offset)[0] + 1
+        depth = self.depth
+        bids = orderbook['bids'][:depth]
+        asks = orderbook['asks'][:depth]
+        values = [math.nan] * (4 * depth)
+        for i in range(len(bids)):
+            values[2 * i] = bids[i][0]
+            values[2 * i + 1] = bids[i][1]
+        for i in range(len(asks)):
+            values[2 * (depth + i)] = asks[i][0]
+            values[2 * (depth + i) + 1] = asks[i][1]
+        timestamp = orderbook.get('timestamp')
+        nonce = orderbook.get('nonce')
+        # the sequence number is written alone, the last, so that a reader never sees it before the data
+        sequence.pack_into(buf, offset, seq)
+        order_book_fields.pack_into(buf, offset + sequence.size, missing if timestamp is None else int(timestamp), missing if nonce is None else int(nonce), len(bids), len(asks))
+        self.levels.pack_into(buf, offset + order_book_header.size, *values)
+        sequence.pack_into(buf, offset, seq + 1)
+
+    def write_ticker(self, symbol, ticker):
+        offset = self.tickers[symbol]
+        buf = self.memory.buf
+        seq = sequence.unpack_from(buf, offset)[0] + 1
+        values = [math.nan if ticker.get(field) is None else float(ticker[field]) for field in ticker_fields]
+        sequence.pack_into(buf, offset, seq)
+        ticker_values.pack_into(buf, offset + sequence.size, *values)
+        sequence.pack_into(buf, offset, seq + 1)
+
+    def read(self, offset, size):
+        buf = self.memory.buf
+        while True:
+            before = sequence.unpack_from(buf, offset)[0]
+            if before & 1:
+                continue
+            data = bytes(buf[offset:offset + size])
+            if sequence.unpack_from(buf, offset)[0] == before:
+                return data
+
+    def order_book(self, symbol):
+        data = self.read(self.orderbooks[symbol], self.order_book_size)
+        seq, timestamp, nonce, bid_count, ask_count = order_book_header.unpack_from(data, 0)
+        if not seq:
+            return None
+        values = self.levels.unpack_from(data, order_book_header.size)
+        depth = self.depth
+        return {
+            'symbol': symbol,
+            'bids': [[values[2 * i], values[2 * i + 1]] for i in range(bid_count)],
+            'asks': [[values[2 * (depth + i)], values[2 * (depth + i) + 1]] for i in range(ask_count)],
+            'timestamp': None if timestamp == missing else timestamp,
+            'nonce': None if nonce == missing else nonce,
+            'sequence': seq // 2,
+        }
+
+    def ticker(self, symbol):
+        data = self.read(self.tickers[symbol], ticker_struct.size)
+        values = ticker_struct.unpack_from(data, 0)
+        if not values[0]:
+            return None
+        result = {'symbol': symbol, 'sequence': values[0] // 2}
+        for i in range(len(ticker_fields)):
+            value = values[i + 1]
+            result[ticker_fields[i]] = None if math.isnan(value) else value
+        result['timestamp'] = None if result['timestamp'] is None else int(result['timestamp'])
+        return result
+
+    def close(self):
+        self.memory.close()
+
+    def unlink(self):
+        self.memory.unlink()
+
+
+# -----------------------------------------------------------------------------
+
+
+async def publish(exchange_id, config, name, stop):
+    import ccxt.pro
+    segment = SharedSegment(name)
+    exchange = getattr(ccxt.pro, exchange_id)(config)
+
+    async def order_books(symbol):
+        while True:
+            try:
+                async for orderbook in exchange.stream_order_book(symbol):
+                    segment.write_order_book(symbol, orderbook)
+            except Exception as e:
+                exchange.logger.warning('%s shared order book %s: %s', exchange_id, symbol, e)
+                await asyncio.sleep(1)
+
+    async def tickers(symbol):
+        while True:
+            try:
+                async for ticker in exchange.stream_ticker(symbol):
+                    segment.write_ticker(symbol, ticker)
+            except Exception as e:
+                exchange.logger.warning('%s shared ticker %s: %s', exchange_id, symbol, e)
+                await asyncio.sleep(1)
+
+    tasks = [asyncio.ensure_future(order_books(symbol)) for symbol in segment.orderbooks]
+    tasks += [asyncio.ensure_future(tickers(symbol)) for symbol in segment.tickers]
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, stop.wait)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await exchange.close()
+        segment.close()
+
+
+def run_worker(exchange_id, config, name, stop):
+    asyncio.run(publish(exchange_id, config, name, stop))
+
+
+class SharedMemoryRunner:
+    """
+    hosts pro exchange instances in worker processes, each one publishes the top levels of its
+    order books and its tickers into a shared memory segment that any process can read by name:
+
+        runner = SharedMemoryRunner()
+        runner.add_worker('binance', orderbooks=['BTC/USDT', 'ETH/USDT'], tickers=['BTC/USDT'])
+        runner.start()
+        runner.order_book('BTC/USDT')  # or SharedSegment(runner.names()[0]) in another process
+        runner.stop()
+    """
+
+    def __init__(self, context=None):
+        self.context = multiprocessing.get_context(context or 'spawn')
+        self.stop_event = self.context.Event()
+        self.workers = []  # (exchange_id, config, SharedSegment)
+        self.processes = []
+
+    def add_worker(self, exchange_id, config={}, orderbooks=[], tickers=[], depth=20, name=None):
+        segment = SharedSegment(name, orderbooks, tickers, depth, create=True)
+        self.workers.append((exchange_id, config, segment))
+        return segment.name
+
+    def names(self):
+        return [segment.name for exchange_id, config, segment in self.workers]
+
+    def start(self):
+        for exchange_id, config, segment in self.workers:
+            process = self.context.Process(target=run_worker, args=(exchange_id, config, segment.name, self.stop_event), daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def segment(self, symbol, kind='orderbooks'):
+        for exchange_id, config, segment in self.workers:
+            if symbol in getattr(segment, kind):
+                return segment
+        raise KeyError(symbol)
+
+    def order_book(self, symbol):
+        return self.segment(symbol).order_book(symbol)
+
+    def ticker(self, symbol):
+        return self.segment(symbol, 'tickers').ticker(symbol)
+
+    def stop(self, timeout=10):
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        for exchange_id, config, segment in self.workers:
+            segment.close()
+            segment.unlink()
+        self.workers = []
@@ -0,0 +1,67 @@
+import asyncio
+import collections
+import contextvars
+
+# the stream that the watch methods called by Exchange.stream_watch() attach to their message hashes
+current_stream = contextvars.ContextVar('current_stream', default=None)
+
+
+class Stream:
+    """A bounded queue of the results resolved for one or more message hashes of the ws clients"""
+
+    def __init__(self, maxsize=1000, conflate=False):
+        self.queue = collections.deque()
+        self.maxsize = maxsize
+        self.conflate = conflate  # keep the latest result only
+        self.waiter = None
+        self.error = None
+        self.subscriptions = []  # (client, message_hash)
+
+    def attach(self, client, message_hash):
+        if (client, message_hash) not in self.subscriptions:
+            self.subscriptions.append((client, message_hash))
+            client.streams.setdefault(message_hash, []).append(self)
+
+    def put(self, result):
+        if self.conflate:
+            self.queue.clear()
+        elif len(self.queue) >= self.maxsize:
+            self.fail(RuntimeError('stream queue is over maxsize (' + str(self.maxsize) + '), the consumer is too slow, use conflate to keep the latest result only'))
+            return
+        self.queue.append(result)
+        self.wake()
+
+    def fail(self, error):
+        if self.error is None:
+            self.error = error
+            self.close()
+        self.wake()
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def close(self):
+        for client, message_hash in self.subscriptions:
+            streams = client.streams.get(message_hash, [])
+            if self in streams:
+                streams.remove(self)
+            if not streams:
+                client.streams.pop(message_hash, None)
+        self.subscriptions = []
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # the queued results are delivered before the error
+        while not self.queue:
+            if self.error is not None:
+                raise self.error
+            self.waiter = asyncio.get_event_loop().create_future()
+            await self.waiter
+            self.waiter = None
+        return self.queue.popleft()
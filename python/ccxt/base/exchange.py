@@ -31,6 +31,9 @@ from ccxt.base.decimal_to_precision import decimal_to_precision
 from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING, TRUNCATE, ROUND, ROUND_UP, ROUND_DOWN, SIGNIFICANT_DIGITS
 from ccxt.base.decimal_to_precision import number_to_string
 from ccxt.base.precise import Precise
+from ccxt.base.json_decoder import get_json_decoder, decode_quoted_json
+from ccxt.base.markets_cache import cache_path, read_cache, settings_digest, write_cache
+from ccxt.base.markets_registry import market_attributes, shared_markets
 from ccxt.base.types import BalanceAccount, Currency, IndexType, OrderSide, OrderType, Trade, OrderRequest, Market, MarketType, Str, Num, Strings
 
 # -----------------------------------------------------------------------------
@@ -74,8 +77,10 @@ import base64
 import binascii
 import calendar
 import collections
+import copy
 import datetime
 from email.utils import parsedate
+from http.cookiejar import DefaultCookiePolicy
 # import functools
 import gzip
 import hashlib
@@ -87,11 +92,13 @@ import random
 from numbers import Number
 import re
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException, ConnectionError as requestsConnectionError
 # import socket
 from ssl import SSLError
 # import sys
+import threading
 import time
 import uuid
 import zlib
@@ -104,6 +111,30 @@ from ccxt.base.types import Int
 
 # -----------------------------------------------------------------------------
 
+# per class results of Exchange.__init__, see class_settings() and camelcase_attributes()
+class_settings_cache = {}
+camelcase_attributes_cache = {}
+
+
+def camelcase_name(name):
+    # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!), None if the name is not in underscore notation
+    if name[0] == '_' or name[-1] == '_' or '_' not in name:
+        return None
+    parts = name.split('_')
+    exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+    return parts[0] + ''.join(exceptions.get(i, Exchange.capitalize(i)) for i in parts[1:])
+
+
+def clone(value):
+    # copies the dicts and the lists of a describe() value, the other values are immutable
+    if isinstance(value, dict):
+        return {key: clone(value[key]) for key in value}
+    if isinstance(value, list):
+        return [clone(item) for item in value]
+    return value
+
+# -----------------------------------------------------------------------------
+
 
 class Exchange(object):
     """Base exchange class"""
@@ -123,6 +154,8 @@ class Exchange(object):
     trust_env = False
     aiohttp_trust_env = False
     requests_trust_env = False
+    # HTTPAdapter arguments of the own sync session, like pool_connections, pool_maxsize, max_retries, pool_block
+    requests_adapter_options = {}
     session = None  # Session () by default
     socks_proxy_sessions = None
     verify = True  # SSL verification
@@ -131,6 +164,15 @@ class Exchange(object):
     logger = None  # logging.getLogger(__name__) by default
     verbose = False
     markets = None
+    # a directory where load_markets() keeps the fetched markets and currencies for other
+    # instances and processes, they are refreshed in the background after markets_cache_ttl ms
+    markets_cache_dir = None
+    markets_cache_ttl = 3600000
+    markets_cache_file = None
+    # instances of the same class and settings load the markets once and share them, the shared
+    # markets and currencies are read only, an instance replaces one with a changed copy of it
+    share_markets = False
+    shared_markets_key = None
     symbols = None
     codes = None
     timeframes = None
@@ -386,6 +428,7 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
+    json_decoder = None  # 'orjson', 'simdjson' or 'ujson' for the ws messages, json.loads by default, see json_decoder.py
     number: Num = float  # or str (a pointer to a class)
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
@@ -448,13 +491,18 @@ class Exchange(object):
         self.origin = self.uuid()
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
-
-        for key in settings:
+        # describe() merged with the class defaults is computed once per class, every
+        # instance gets its own copy of it and only the keys of the config are merged
+        described, defaults = self.class_settings()
+        for key in defaults:
+            if key not in config:
+                setattr(self, key, clone(defaults[key]))
+        for key in config:
+            value = self.deep_extend(clone(described.get(key)), config[key])
             if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
+                setattr(self, key, self.deep_extend(getattr(self, key), value))
             else:
-                setattr(self, key, settings[key])
+                setattr(self, key, value)
 
         if self.markets:
             self.set_markets(self.markets)
@@ -462,22 +510,24 @@ class Exchange(object):
         self.after_construct()
 
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
+        # the methods are aliased on the class by the first instance, see camelcase_attributes()
         cls = type(self)
-        for name in dir(self):
-            if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    if hasattr(self, camelcase):
-                        if attr is not None:
-                            setattr(self, camelcase, attr)
-                    else:
+        attributes, class_names = self.camelcase_attributes()
+        for name in sorted(self.__dict__):
+            if name not in class_names:
+                camelcase = camelcase_name(name)
+                if camelcase is not None:
+                    attributes.append((name, camelcase))
+        for name, camelcase in attributes:
+            attr = getattr(self, name)
+            if isinstance(attr, types.MethodType):
+                setattr(cls, camelcase, getattr(cls, name))
+            else:
+                if hasattr(self, camelcase):
+                    if attr is not None:
                         setattr(self, camelcase, attr)
+                else:
+                    setattr(self, camelcase, attr)
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf'),
@@ -487,10 +537,21 @@ class Exchange(object):
         }, getattr(self, 'tokenBucket', {}))
 
         if not self.session and self.synchronous:
-            self.session = Session()
-            self.session.trust_env = self.requests_trust_env
+            self.session = self.create_session()
+        self.throttle_lock = threading.Lock()
+        self.json_loads = get_json_decoder(self.json_decoder)
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
 
+    def create_session(self):
+        session = Session()
+        session.trust_env = self.requests_trust_env
+        # no cookies are stored, so the threads that share the session never clear them under a request in flight
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(**self.requests_adapter_options)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def __del__(self):
         if self.session:
             try:
@@ -507,14 +568,52 @@ class Exchange(object):
     def describe(self):
         return {}
 
+    def class_settings(self):
+        # returns describe() and the attributes it sets on an instance without a config, both
+        # are shared by the instances of the class and must not be mutated, the number type
+        # is part of the key because describe() parses the fees with self.parse_number
+        cls = type(self)
+        key = (cls, self.number)
+        if key not in class_settings_cache:
+            described = self.describe()
+            defaults = {}
+            for name in described:
+                if hasattr(self, name) and isinstance(getattr(self, name), dict):
+                    defaults[name] = self.deep_extend(getattr(self, name), described[name])
+                else:
+                    defaults[name] = described[name]
+            class_settings_cache[key] = (described, defaults)
+        return class_settings_cache[key]
+
+    def camelcase_attributes(self):
+        # aliases the methods of the class once and returns a new list of the (name, camelcase)
+        # pairs of the other attributes of the class with the set of the names of the class
+        cls = type(self)
+        if cls not in camelcase_attributes_cache:
+            attributes = []
+            class_names = set(dir(cls))
+            for name in sorted(class_names):
+                camelcase = camelcase_name(name)
+                if camelcase is not None:
+                    if isinstance(getattr(self, name), types.MethodType):
+                        setattr(cls, camelcase, getattr(cls, name))
+                    else:
+                        attributes.append((name, camelcase))
+            camelcase_attributes_cache[cls] = (attributes, class_names)
+        attributes, class_names = camelcase_attributes_cache[cls]
+        return list(attributes), class_names
+
     def throttle(self, cost=None):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        cost = 1 if cost is None else cost
-        sleep_time = self.rateLimit * cost
-        if elapsed < sleep_time:
-            delay = sleep_time - elapsed
-            time.sleep(delay / 1000.0)
+        # the lock spaces the requests of all the threads that share the instance
+        with self.throttle_lock:
+            now = float(self.milliseconds())
+            elapsed = now - self.lastRestRequestTimestamp
+            cost = 1 if cost is None else cost
+            sleep_time = self.rateLimit * cost
+            if elapsed < sleep_time:
+                delay = sleep_time - elapsed
+                time.sleep(delay / 1000.0)
+            self.lastRestRequestTimestamp = self.milliseconds()
 
     @staticmethod
     def gzip_deflate(response, text):
@@ -548,9 +647,9 @@ class Exchange(object):
 
     def on_json_response(self, response_body):
         if self.quoteJsonNumbers:
-            return json.loads(response_body, parse_float=str, parse_int=str)
+            return decode_quoted_json(response_body)
         else:
-            return json.loads(response_body)
+            return self.json_loads(response_body)
 
     def fetch(self, url, method='GET', headers=None, body=None):
         """Perform a HTTP request and return decoded JSON data"""
@@ -593,7 +692,9 @@ class Exchange(object):
         if body:
             body = body.encode()
 
-        self.session.cookies.clear()
+        # the cookies of a session from the config are cleared, it is not safe to share between threads
+        if self.session.cookies:
+            self.session.cookies.clear()
 
         http_response = None
         http_status_code = None
@@ -971,8 +1072,9 @@ class Exchange(object):
             if isinstance(arg, dict):
                 if not isinstance(result, dict):
                     result = {}
-                for key in arg:
-                    result[key] = Exchange.deep_extend(result[key] if key in result else None, arg[key])
+                for key, value in arg.items():
+                    # only nested dicts are merged, other values replace the previous ones as they are
+                    result[key] = Exchange.deep_extend(result.get(key), value) if isinstance(value, dict) else value
             else:
                 result = arg
         return result
@@ -1510,12 +1612,103 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
+        if self.share_markets and not params:
+            return self.load_shared_markets(reload)
+        return self.fetch_and_set_markets(reload, params)
+
+    def fetch_and_set_markets(self, reload=False, params={}):
+        if not reload and self.markets_cache_dir and not params and self.load_markets_from_cache():
+            return self.markets
         currencies = None
         if self.has['fetchCurrencies'] is True:
             currencies = self.fetch_currencies()
         markets = self.fetch_markets(params)
+        if self.markets_cache_dir and not params:
+            self.write_markets_cache(markets, currencies)
         return self.set_markets(markets, currencies)
 
+    def load_shared_markets(self, reload=False):
+        shared = self.shared_markets()
+        generation = shared.generation
+        with shared.lock:
+            # the instance that got the lock first loads the markets, the others wait for them
+            if shared.snapshot is not None and (not reload or shared.generation != generation):
+                return shared.attach(self)
+            self.fetch_and_set_markets(reload)
+            shared.publish(self)
+        return self.markets
+
+    def shared_markets(self):
+        if self.shared_markets_key is None:
+            self.shared_markets_key = (type(self), settings_digest(self.markets_settings()))
+        return shared_markets(self.shared_markets_key)
+
+    def markets_settings(self):
+        # the settings that can change the loaded markets, as they are when the markets are first loaded
+        return {
+            'urls': self.urls.get('api'),
+            'hostname': self.hostname,
+            'options': self.options,
+            'number': self.number,
+        }
+
+    def markets_cache_path(self):
+        if self.markets_cache_file is None:
+            self.markets_cache_file = cache_path(self.markets_cache_dir, self.id, self.markets_settings())
+        return self.markets_cache_file
+
+    def load_markets_from_cache(self):
+        entry = read_cache(self.markets_cache_path(), __version__)
+        if entry is None:
+            return False
+        self.set_markets(entry['markets'], entry['currencies'])
+        if self.milliseconds() - entry['timestamp'] > self.markets_cache_ttl:
+            self.refresh_markets_cache()
+        return True
+
+    def write_markets_cache(self, markets, currencies):
+        try:
+            write_cache(self.markets_cache_path(), __version__, markets, currencies)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning('%s could not write the markets cache: %s', self.id, e)
+
+    def refresh_markets_cache(self):
+        # the cached markets are used meanwhile
+        thread = threading.Thread(target=self.update_markets_cache, daemon=True)
+        thread.start()
+        return thread
+
+    def markets_refresher(self):
+        # a copy of the instance with its own session, so the calls of the caller keep their session and
+        # markets meanwhile, its requests are spaced by the throttle and the timestamp of the instance
+        refresher = copy.copy(self)
+        refresher.session = self.create_session()
+        refresher.throttle = self.throttle
+        return refresher
+
+    def update_markets_cache(self):
+        refresher = self.markets_refresher()
+        try:
+            currencies = None
+            if refresher.has['fetchCurrencies'] is True:
+                currencies = refresher.fetch_currencies()
+            markets = refresher.fetch_markets()
+            self.write_markets_cache(markets, currencies)
+            refresher.set_markets(markets, currencies)
+            self.swap_markets(refresher)
+            if self.share_markets:
+                self.shared_markets().publish(self)
+        except Exception as e:
+            self.logger.warning('%s could not refresh the markets cache: %s', self.id, e)
+        finally:
+            refresher.session.close()
+
+    def swap_markets(self, source):
+        # the attributes are assigned one after the other, a thread that reads them meanwhile
+        # can see the new markets with the previous markets_by_id for a moment
+        for name in market_attributes:
+            setattr(self, name, getattr(source, name, None))
+
     def fetch_markets(self, params={}):
         # markets are returned as a list
         # currencies are returned as a dict
@@ -2483,29 +2676,55 @@ class Exchange(object):
         return cleanStructure
 
     def set_markets(self, markets, currencies=None):
-        values = []
-        self.markets_by_id = {}
+        # the defaults are merged once, every market copies their nested objects
+        template = self.deep_extend(self.safe_market_structure(), {
+            'precision': self.precision,
+            'limits': self.limits,
+        }, self.fees['trading'])
+        templateKeys = list(template.keys())
+        nestedKeys = []
+        for i in range(0, len(templateKeys)):
+            key = templateKeys[i]
+            if isinstance(template[key], dict):
+                nestedKeys.append(key)
         # handle marketId conflicts
         # we insert spot markets first
-        marketValues = self.sort_by(self.to_array(markets), 'spot', True, True)
+        spotValues = []
+        otherValues = []
+        allValues = self.to_array(markets)
+        for i in range(0, len(allValues)):
+            value = allValues[i]
+            if self.safe_bool(value, 'spot', True):
+                spotValues.append(value)
+            else:
+                otherValues.append(value)
+        marketValues = self.array_concat(spotValues, otherValues)
+        values = []
+        marketsById = {}
+        marketsBySymbol = {}
         for i in range(0, len(marketValues)):
             value = marketValues[i]
-            if value['id'] in self.markets_by_id:
-                (self.markets_by_id[value['id']]).append(value)
-            else:
-                self.markets_by_id[value['id']] = [value]
-            market = self.deep_extend(self.safe_market_structure(), {
-                'precision': self.precision,
-                'limits': self.limits,
-            }, self.fees['trading'], value)
+            id = value['id']
+            symbol = self.safe_string(value, 'symbol')
+            market = self.extend(template, value)
+            for j in range(0, len(nestedKeys)):
+                key = nestedKeys[j]
+                market[key] = self.deep_extend(template[key], value[key]) if (key in value) else self.deep_extend(template[key])
             if market['linear']:
                 market['subType'] = 'linear'
             elif market['inverse']:
                 market['subType'] = 'inverse'
             else:
                 market['subType'] = None
+            if id in marketsById:
+                (marketsById[id]).append(value)
+            else:
+                marketsById[id] = [value]
+            if symbol is not None:
+                marketsBySymbol[symbol] = market
             values.append(market)
-        self.markets = self.index_by(values, 'symbol')
+        self.markets_by_id = marketsById
+        self.markets = marketsBySymbol
         marketsSortedBySymbol = self.keysort(self.markets)
         marketsSortedById = self.keysort(self.markets_by_id)
         self.symbols = list(marketsSortedBySymbol.keys())
@@ -2514,54 +2733,73 @@ class Exchange(object):
             # currencies is always None when called in constructor but not when called from loadMarkets
             self.currencies = self.deep_extend(self.currencies, currencies)
         else:
-            baseCurrencies = []
-            quoteCurrencies = []
+            # the currency structures are built once per code, from the last market and from the market with the highest precision
+            defaultCurrencyPrecision = 8 if (self.precisionMode == DECIMAL_PLACES) else self.parse_number('1e-8')
+            lastBaseMarkets = {}
+            lastQuoteMarkets = {}
+            bestBaseMarkets = {}
+            bestQuoteMarkets = {}
+            bestBasePrecisions = {}
+            bestQuotePrecisions = {}
             for i in range(0, len(values)):
                 market = values[i]
-                defaultCurrencyPrecision = 8 if (self.precisionMode == DECIMAL_PLACES) else self.parse_number('1e-8')
-                marketPrecision = self.safe_dict(market, 'precision', {})
-                if 'base' in market:
-                    currency = self.safe_currency_structure({
-                        'id': self.safe_string_2(market, 'baseId', 'base'),
-                        'numericId': self.safe_integer(market, 'baseNumericId'),
-                        'code': self.safe_string(market, 'base'),
-                        'precision': self.safe_value_2(marketPrecision, 'base', 'amount', defaultCurrencyPrecision),
-                    })
-                    baseCurrencies.append(currency)
-                if 'quote' in market:
-                    currency = self.safe_currency_structure({
-                        'id': self.safe_string_2(market, 'quoteId', 'quote'),
-                        'numericId': self.safe_integer(market, 'quoteNumericId'),
-                        'code': self.safe_string(market, 'quote'),
-                        'precision': self.safe_value_2(marketPrecision, 'quote', 'price', defaultCurrencyPrecision),
-                    })
-                    quoteCurrencies.append(currency)
-            baseCurrencies = self.sort_by(baseCurrencies, 'code', False, '')
-            quoteCurrencies = self.sort_by(quoteCurrencies, 'code', False, '')
-            self.baseCurrencies = self.index_by(baseCurrencies, 'code')
-            self.quoteCurrencies = self.index_by(quoteCurrencies, 'code')
-            allCurrencies = self.array_concat(baseCurrencies, quoteCurrencies)
-            groupedCurrencies = self.group_by(allCurrencies, 'code')
-            codes = list(groupedCurrencies.keys())
-            resultingCurrencies = []
+                base = self.safe_string(market, 'base')
+                if base is not None:
+                    lastBaseMarkets[base] = market
+                    basePrecision = self.market_currency_precision(market, 'base', defaultCurrencyPrecision)
+                    if not (base in bestBaseMarkets) or self.is_higher_currency_precision(basePrecision, bestBasePrecisions[base]):
+                        bestBaseMarkets[base] = market
+                        bestBasePrecisions[base] = basePrecision
+                quote = self.safe_string(market, 'quote')
+                if quote is not None:
+                    lastQuoteMarkets[quote] = market
+                    quotePrecision = self.market_currency_precision(market, 'quote', defaultCurrencyPrecision)
+                    if not (quote in bestQuoteMarkets) or self.is_higher_currency_precision(quotePrecision, bestQuotePrecisions[quote]):
+                        bestQuoteMarkets[quote] = market
+                        bestQuotePrecisions[quote] = quotePrecision
+            baseCodes = list(self.keysort(lastBaseMarkets).keys())
+            quoteCodes = list(self.keysort(lastQuoteMarkets).keys())
+            self.baseCurrencies = {}
+            for i in range(0, len(baseCodes)):
+                code = baseCodes[i]
+                self.baseCurrencies[code] = self.market_currency_structure(lastBaseMarkets[code], 'base', defaultCurrencyPrecision)
+            self.quoteCurrencies = {}
+            for i in range(0, len(quoteCodes)):
+                code = quoteCodes[i]
+                self.quoteCurrencies[code] = self.market_currency_structure(lastQuoteMarkets[code], 'quote', defaultCurrencyPrecision)
+            codes = list(self.keysort(self.extend(lastBaseMarkets, lastQuoteMarkets)).keys())
+            resultingCurrencies = {}
             for i in range(0, len(codes)):
                 code = codes[i]
-                groupedCurrenciesCode = self.safe_list(groupedCurrencies, code, [])
-                highestPrecisionCurrency = self.safe_value(groupedCurrenciesCode, 0)
-                for j in range(1, len(groupedCurrenciesCode)):
-                    currentCurrency = groupedCurrenciesCode[j]
-                    if self.precisionMode == TICK_SIZE:
-                        highestPrecisionCurrency = currentCurrency if (currentCurrency['precision'] < highestPrecisionCurrency['precision']) else highestPrecisionCurrency
-                    else:
-                        highestPrecisionCurrency = currentCurrency if (currentCurrency['precision'] > highestPrecisionCurrency['precision']) else highestPrecisionCurrency
-                resultingCurrencies.append(highestPrecisionCurrency)
-            sortedCurrencies = self.sort_by(resultingCurrencies, 'code')
-            self.currencies = self.deep_extend(self.currencies, self.index_by(sortedCurrencies, 'code'))
+                # the base markets are compared first, a quote market has to be strictly more precise
+                if (code in bestQuoteMarkets) and (not (code in bestBaseMarkets) or self.is_higher_currency_precision(bestQuotePrecisions[code], bestBasePrecisions[code])):
+                    resultingCurrencies[code] = self.market_currency_structure(bestQuoteMarkets[code], 'quote', defaultCurrencyPrecision)
+                else:
+                    resultingCurrencies[code] = self.market_currency_structure(bestBaseMarkets[code], 'base', defaultCurrencyPrecision)
+            self.currencies = self.deep_extend(self.currencies, resultingCurrencies)
         self.currencies_by_id = self.index_by(self.currencies, 'id')
         currenciesSortedByCode = self.keysort(self.currencies)
         self.codes = list(currenciesSortedByCode.keys())
         return self.markets
 
+    def market_currency_structure(self, market, side: str, defaultPrecision):
+        return self.safe_currency_structure({
+            'id': self.safe_string_2(market, side + 'Id', side),
+            'numericId': self.safe_integer(market, side + 'NumericId'),
+            'code': self.safe_string(market, side),
+            'precision': self.market_currency_precision(market, side, defaultPrecision),
+        })
+
+    def market_currency_precision(self, market, side: str, defaultPrecision):
+        marketPrecision = self.safe_dict(market, 'precision', {})
+        precisionKey = 'amount' if (side == 'base') else 'price'
+        return self.safe_value_2(marketPrecision, side, precisionKey, defaultPrecision)
+
+    def is_higher_currency_precision(self, precision, otherPrecision):
+        if self.precisionMode == TICK_SIZE:
+            return precision < otherPrecision
+        return precision > otherPrecision
+
     def get_describe_for_extended_ws_exchange(self, currentRestInstance: Any, parentRestInstance: Any, wsBaseDescribe: dict):
         extendedRestDescribe = self.deep_extend(parentRestInstance.describe(), currentRestInstance.describe())
         superWithRestDescribe = self.deep_extend(extendedRestDescribe, wsBaseDescribe)
@@ -0,0 +1,69 @@
+import json
+
+from ccxt.base.errors import NotSupported
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+__all__ = [
+    'decoders',
+    'get_json_decoder',
+    'decode_quoted_json',
+]
+
+# decoders by name, from the fastest one, all of them take str or bytes, json is the default and the
+# others are opt-in, they can parse numbers differently, orjson returns integers over 64 bits as floats
+decoders = {}
+if orjson is not None:
+    decoders['orjson'] = orjson.loads
+if simdjson is not None:
+    decoders['simdjson'] = simdjson.loads
+if ujson is not None:
+    decoders['ujson'] = ujson.loads
+decoders['json'] = json.loads
+
+# only the stdlib scanner keeps the original text of the numbers, as needed by Precise
+quoted_decoder = json.JSONDecoder(parse_float=str, parse_int=str)
+
+
+def get_json_decoder(name=None):
+    if name is None:
+        name = 'json'
+    if name not in decoders:
+        raise NotSupported('json decoder ' + name + ' is not installed, the available decoders are ' + ', '.join(decoders))
+    loads = decoders[name]
+    if loads is json.loads:
+        return decode_json
+
+    def decode(data):
+        try:
+            return loads(data)
+        except ValueError:
+            # NaN and other input the fast decoders reject
+            return json.loads(data)
+    return decode
+
+
+def decode_json(data):
+    # decoding the bytes first is faster than letting json detect the encoding
+    if isinstance(data, bytes):
+        data = data.decode()
+    return json.loads(data)
+
+
+def decode_quoted_json(data):
+    if isinstance(data, bytes):
+        data = data.decode()
+    return quoted_decoder.decode(data)
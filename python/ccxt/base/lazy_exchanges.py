@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+"""Imports the exchange classes of a package on first access"""
+
+import importlib
+import sys
+import types
+
+
+class ExchangePackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # the import system binds every loaded submodule on its package, so loading
+        # ccxt.async_support.binance from ccxt.pro.binance would shadow the class
+        if isinstance(value, types.ModuleType) and name in self.__dict__.get('exchanges', ()):
+            value = getattr(value, name)
+        super(ExchangePackage, self).__setattr__(name, value)
+
+
+def lazy_exchanges(package_name):
+    # returns the module level __getattr__ and __dir__ of a package that lists its exchange ids in exchanges
+    package = sys.modules[package_name]
+    package.__class__ = ExchangePackage
+
+    def __getattr__(name):
+        if name in package.exchanges:
+            exchange = getattr(importlib.import_module(package_name + '.' + name), name)
+            setattr(package, name, exchange)
+            return exchange
+        raise AttributeError('module ' + repr(package_name) + ' has no attribute ' + repr(name))
+
+    def __dir__():
+        return sorted(set(package.__dict__) | set(package.exchanges))
+
+    return __getattr__, __dir__
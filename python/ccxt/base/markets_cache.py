@@ -0,0 +1,59 @@
+"""Markets and currencies persisted in a local directory that several processes share"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+__all__ = [
+    'cache_path',
+    'read_cache',
+    'settings_digest',
+    'write_cache',
+]
+
+# bumped when the layout of the file changes, files of another format are ignored
+cache_format = 1
+
+
+def settings_digest(settings):
+    # the settings are hashed as sorted json so that every process gets the same digest
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=repr).encode()).hexdigest()[:16]
+
+
+def cache_path(directory, exchange_id, settings):
+    return os.path.join(directory, exchange_id + '-' + settings_digest(settings) + '.json')
+
+
+def read_cache(path, version):
+    # returns None if the file is missing, unreadable or written by another version of ccxt
+    try:
+        with open(path, encoding='utf-8') as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get('format') != cache_format or entry.get('version') != version:
+        return None
+    return entry
+
+
+def write_cache(path, version, markets, currencies):
+    # writes a temporary file next to the cache and renames it, a reader never sees a partial file
+    data = json.dumps({
+        'format': cache_format,
+        'version': version,
+        'timestamp': int(time.time() * 1000),
+        'markets': markets,
+        'currencies': currencies,
+    }, separators=(',', ':'))
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
@@ -0,0 +1,108 @@
+"""Markets loaded once and shared by the instances of an exchange class in one process"""
+
+import threading
+import types
+
+__all__ = [
+    'FrozenDict',
+    'FrozenList',
+    'SharedMarkets',
+    'market_attributes',
+    'shared_markets',
+]
+
+# the attributes that set_markets() assigns
+market_attributes = [
+    'markets',
+    'markets_by_id',
+    'symbols',
+    'ids',
+    'currencies',
+    'currencies_by_id',
+    'codes',
+    'baseCurrencies',
+    'quoteCurrencies',
+]
+
+
+def read_only(self, *args, **kwargs):
+    raise TypeError('the shared markets are read only, replace a market or a currency with a copy instead, like exchange.markets[symbol] = exchange.deep_extend(market, changes)')
+
+
+class FrozenDict(dict):
+    """A market, a currency or a dict nested in them, shared by the instances and read only, its copies are plain dicts"""
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = read_only
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """A list nested in a market or a currency, shared by the instances and read only, its copies are plain lists"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = clear = extend = insert = pop = remove = reverse = sort = read_only
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze_value(value):
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze_value(value[key])) for key in value)
+    if isinstance(value, list):
+        return FrozenList(freeze_value(item) for item in value)
+    return value
+
+
+def freeze(value):
+    # the snapshot holds read only copies of the containers and of the markets and currencies in them
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: freeze_value(value[key]) for key in value})
+    if isinstance(value, list):
+        return tuple(freeze_value(item) for item in value)
+    return value
+
+
+def thaw(value):
+    # every instance gets its own containers, so replacing a market in one of them does not affect the others
+    if isinstance(value, types.MappingProxyType):
+        return dict(value)
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+class SharedMarkets(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot = None
+        # incremented on every publish, a waiting instance uses a load that finished meanwhile
+        self.generation = 0
+        # the asyncio future of the load in flight
+        self.loading = None
+
+    def publish(self, exchange):
+        self.snapshot = {name: freeze(getattr(exchange, name, None)) for name in market_attributes}
+        self.generation += 1
+        # the instance that loaded the markets shares them as well
+        return self.attach(exchange)
+
+    def attach(self, exchange):
+        snapshot = self.snapshot
+        for name in market_attributes:
+            setattr(exchange, name, thaw(snapshot[name]))
+        return exchange.markets
+
+
+registry = {}
+registry_lock = threading.Lock()
+
+
+def shared_markets(key):
+    with registry_lock:
+        if key not in registry:
+            registry[key] = SharedMarkets()
+        return registry[key]
@@ -1187,6 +1187,27 @@ class binance(Exchange, ImplicitAPI):
             # exchange-specific options
             'options': {
                 'sandboxMode': False,
+                # used by the python async rate limiter when adaptiveRateLimit is enabled, per api because the quotas and the
+                # cost of a unit of weight differ, see the comments of the api costs
+                'rateLimitHeaders': {
+                    # spot, 6000 weight per minute, 1 weight => cost = 0.2
+                    'public': {'used': 'x-mbx-used-weight-1m', 'limit': 6000, 'window': 60000, 'scale': 0.2},
+                    'private': {'used': 'x-mbx-used-weight-1m', 'limit': 6000, 'window': 60000, 'scale': 0.2},
+                    'v1': {'used': 'x-mbx-used-weight-1m', 'limit': 6000, 'window': 60000, 'scale': 0.2},
+                    # sapi, 12000 ip weight per minute, 1 weight => cost = 0.1
+                    'sapi': {'used': 'x-sapi-used-ip-weight-1m', 'limit': 12000, 'window': 60000, 'scale': 0.1},
+                    'sapiV2': {'used': 'x-sapi-used-ip-weight-1m', 'limit': 12000, 'window': 60000, 'scale': 0.1},
+                    'sapiV3': {'used': 'x-sapi-used-ip-weight-1m', 'limit': 12000, 'window': 60000, 'scale': 0.1},
+                    'sapiV4': {'used': 'x-sapi-used-ip-weight-1m', 'limit': 12000, 'window': 60000, 'scale': 0.1},
+                    # fapi and dapi, 2400 weight per minute, 1 weight => cost = 1
+                    'fapiPublic': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'fapiPublicV2': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'fapiPrivate': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'fapiPrivateV2': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'dapiPublic': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'dapiPrivate': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                    'dapiPrivateV2': {'used': 'x-mbx-used-weight-1m', 'limit': 2400, 'window': 60000, 'scale': 1},
+                },
                 'fetchMarkets': [
                     'spot',  # allows CORS in browsers
                     'linear',  # allows CORS in browsers
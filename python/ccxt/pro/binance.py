@@ -420,6 +420,23 @@ class binance(ccxt.async_support.binance):
                 del client.subscriptions[messageHash]
                 client.reject(e, messageHash)
 
+    def on_reconnected(self, client: Client):
+        #
+        # the order books of the connection are kept while the subscriptions are replayed,
+        # the new deltas are cached until the snapshots are fetched again
+        #
+        subscriptions = list(client.subscriptions.values())
+        for i in range(0, len(subscriptions)):
+            subscription = subscriptions[i]
+            if self.safe_string(subscription, 'name') == 'depth':
+                symbolOfSubscription = self.safe_string(subscription, 'symbol')
+                symbols = self.safe_value(subscription, 'symbols', [symbolOfSubscription])
+                for j in range(0, len(symbols)):
+                    orderbook = self.safe_value(self.orderbooks, symbols[j])
+                    if orderbook is not None:
+                        orderbook['nonce'] = None
+                        orderbook.cache = []
+
     def handle_order_book_subscription(self, client: Client, message, subscription):
         defaultLimit = self.safe_integer(self.options, 'watchOrderBookLimit', 1000)
         # messageHash = self.safe_string(subscription, 'messageHash')
@@ -429,9 +446,12 @@ class binance(ccxt.async_support.binance):
         # handle list of symbols
         for i in range(0, len(symbols)):
             symbol = symbols[i]
-            if symbol in self.orderbooks:
-                del self.orderbooks[symbol]
-            self.orderbooks[symbol] = self.order_book({}, limit)
+            stored = self.safe_value(self.orderbooks, symbol)
+            # a resubscription after a reconnect keeps the order book, see on_reconnected
+            if (stored is None) or (stored['nonce'] is not None):
+                if symbol in self.orderbooks:
+                    del self.orderbooks[symbol]
+                self.orderbooks[symbol] = self.order_book({}, limit)
             subscription = self.extend(subscription, {'symbol': symbol})
             # fetch the snapshot in a separate async call
             self.spawn(self.fetch_order_book_snapshot, client, message, subscription)
@@ -0,0 +1,69 @@
+import os
+import sys
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book import IndexedOrderBook, QueuedOrderBook  # noqa: E402
+
+# an l3 feed with thousands of orders resting at a few popular prices, every update
+# adds, modifies or cancels one order and the consumer reads the top of the book
+
+orders = 20000
+prices = 20
+updates = 20000
+depth = 100
+
+
+def generate_updates(seed=1):
+    rng = random.Random(seed)
+    snapshot = {
+        'bids': [[1000 - rng.randint(0, prices), rng.randint(1, 100), i] for i in range(orders)],
+        'asks': [],
+    }
+    live = list(range(orders))
+    next_id = orders
+    result = []
+    for _ in range(updates):
+        action = rng.random()
+        if action < 0.4:
+            result.append([1000 - rng.randint(0, prices), rng.randint(1, 100), next_id])
+            live.append(next_id)
+            next_id += 1
+        else:
+            position = rng.randrange(len(live))
+            order_id = live[position]
+            if action < 0.8:
+                live[position] = live[-1]
+                live.pop()
+                result.append([None, 0, order_id])
+            else:
+                result.append([None, rng.randint(1, 100), order_id])
+    return snapshot, result
+
+
+def replay(cls, snapshot, deltas):
+    book = cls(snapshot, depth)
+    bids = book['bids']
+    start = time.perf_counter()
+    for i, delta in enumerate(deltas):
+        bids.storeArray(list(delta))
+        if i % 10 == 0:
+            bids[0]
+    book.limit()
+    return time.perf_counter() - start, book
+
+
+def main():
+    snapshot, deltas = generate_updates()
+    print(f'{orders} resting orders at {prices + 1} prices, {updates} updates')
+    for cls in (IndexedOrderBook, QueuedOrderBook):
+        elapsed, book = replay(cls, snapshot, deltas)
+        print(f'{cls.__name__:<18} {elapsed * 1000:10.1f}ms {updates / elapsed:12,.0f} updates/s')
+
+
+main()
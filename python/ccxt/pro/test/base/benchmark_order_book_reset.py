@@ -0,0 +1,93 @@
+import os
+import sys
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book import OrderBook, CountedOrderBook, IndexedOrderBook, ArrayOrderBook  # noqa: E402
+
+# loads 10k-level snapshots with OrderBook.reset and compares it with storing the
+# levels one by one, the previous implementation of reset, the sorted snapshot takes
+# the one pass path, the shuffled one with duplicates and empty levels is sorted first
+
+levels = 10000
+repeat = 20
+
+
+def generate_snapshot(kind, rng):
+    tick = 0.01
+    mid = 30000.0
+    bids = []
+    asks = []
+    for i in range(levels):
+        bid = [round(mid - (i + 1) * tick, 2), rng.randint(1, 1000) / 100]
+        ask = [round(mid + (i + 1) * tick, 2), rng.randint(1, 1000) / 100]
+        if kind == 'counted':
+            bid.append(rng.randint(1, 10))
+            ask.append(rng.randint(1, 10))
+        elif kind == 'indexed':
+            bid.append('b' + str(i).zfill(6))
+            ask.append('a' + str(i).zfill(6))
+        bids.append(bid)
+        asks.append(ask)
+    return {'bids': bids, 'asks': asks, 'nonce': 1}
+
+
+def shuffle(snapshot, rng):
+    result = {'nonce': 1}
+    for key in ('bids', 'asks'):
+        deltas = snapshot[key] + [list(delta) for delta in rng.sample(snapshot[key], levels // 10)]
+        for delta in rng.sample(deltas, levels // 100):
+            deltas.append([delta[0], 0] + delta[2:])
+        rng.shuffle(deltas)
+        result[key] = deltas
+    return result
+
+
+def copy(snapshot):
+    return {
+        'bids': [list(delta) for delta in snapshot['bids']],
+        'asks': [list(delta) for delta in snapshot['asks']],
+        'nonce': snapshot['nonce'],
+    }
+
+
+def store_one_by_one(book, snapshot):
+    book['asks'].clear()
+    for ask in snapshot['asks']:
+        book['asks'].storeArray(ask)
+    book['bids'].clear()
+    for bid in snapshot['bids']:
+        book['bids'].storeArray(bid)
+
+
+def run(book, snapshots, method):
+    start = time.perf_counter()
+    for snapshot in snapshots:
+        method(book, snapshot)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(1)
+    print(f'{levels} levels per side, {repeat} snapshots')
+    for cls, kind in ((OrderBook, 'plain'), (CountedOrderBook, 'counted'), (IndexedOrderBook, 'indexed'), (ArrayOrderBook, 'plain')):
+        sorted_snapshot = generate_snapshot(kind, rng)
+        for order, snapshot in (('sorted', sorted_snapshot), ('shuffled', shuffle(sorted_snapshot, rng))):
+            results = {}
+            for name, method in (('storeArray', store_one_by_one), ('reset', OrderBook.reset)):
+                book = cls()
+                snapshots = [copy(snapshot) for _ in range(repeat)]
+                elapsed = run(book, snapshots, method)
+                book.limit()
+                results[name] = book
+                print(f'{cls.__name__:<18} {order:<9} {name:<11} {elapsed * 1000 / repeat:8.2f}ms per snapshot')
+            assert results['storeArray']['bids'] == results['reset']['bids']
+            assert results['storeArray']['asks'] == results['reset']['asks']
+
+
+main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import random
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book import OrderBook, ArrayOrderBook, LazyOrderBook  # noqa: E402
+
+# replays depth deltas against the list-backed, array-backed and lazy order books
+# usage: python benchmark_order_book_side.py [deltas.jsonl]
+# each line of the optional file is a recorded depth message with 'bids' and 'asks'
+# lists of [price, size] deltas, otherwise a random walk around a mid price is used
+# both books keep the full side, the consumer reads the top of the book
+
+levels = 5000
+messages = 20000
+limit_every = 10
+depths = [20, 100, 1000, None]
+
+
+def generate_deltas(seed=1):
+    rng = random.Random(seed)
+    tick = 0.01
+    mid = 30000.0
+    snapshot = {
+        'bids': [[round(mid - (i + 1) * tick, 2), rng.randint(1, 1000) / 100] for i in range(levels)],
+        'asks': [[round(mid + (i + 1) * tick, 2), rng.randint(1, 1000) / 100] for i in range(levels)],
+    }
+    deltas = []
+    for _ in range(messages):
+        mid += rng.choice((-tick, 0, tick))
+        message = {'bids': [], 'asks': []}
+        for _ in range(rng.randint(1, 20)):
+            # most of the traffic happens close to the top of the book
+            distance = int(rng.expovariate(1 / 50)) + 1
+            size = 0 if rng.random() < 0.25 else rng.randint(1, 1000) / 100
+            message['bids'].append([round(mid - distance * tick, 2), size])
+            message['asks'].append([round(mid + distance * tick, 2), size])
+        deltas.append(message)
+    return snapshot, deltas
+
+
+def load_deltas(path):
+    with open(path) as file:
+        deltas = [json.loads(line) for line in file if line.strip()]
+    return {'bids': [], 'asks': []}, deltas
+
+
+def replay(cls, snapshot, deltas, depth):
+    # the list-backed book trims its levels to the depth, so it has to be unbounded here
+    book = cls(snapshot) if cls is OrderBook else cls(snapshot, depth)
+    start = time.perf_counter()
+    for i, message in enumerate(deltas):
+        bids = book['bids']
+        asks = book['asks']
+        for delta in message['bids']:
+            bids.storeArray([float(delta[0]), float(delta[1])])
+        for delta in message['asks']:
+            asks.storeArray([float(delta[0]), float(delta[1])])
+        if i % limit_every == 0:
+            book.limit()
+            book['bids'][0]
+            book['asks'][0]
+    book.limit()
+    return time.perf_counter() - start, book
+
+
+def main():
+    if len(sys.argv) > 1:
+        snapshot, deltas = load_deltas(sys.argv[1])
+    else:
+        snapshot, deltas = generate_deltas()
+    num_deltas = sum(len(message['bids']) + len(message['asks']) for message in deltas)
+    print(f'{len(deltas)} messages, {num_deltas} deltas')
+    for depth in depths:
+        results = {}
+        for cls in (OrderBook, ArrayOrderBook, LazyOrderBook):
+            elapsed, book = replay(cls, snapshot, deltas, depth)
+            results[cls.__name__] = book
+            print(f'depth {str(depth):<6} {cls.__name__:<16} {elapsed * 1000:10.1f}ms {num_deltas / elapsed:12,.0f} deltas/s')
+        for name in ('ArrayOrderBook', 'LazyOrderBook'):
+            assert results['OrderBook']['bids'][:depth] == results[name]['bids']
+            assert results['OrderBook']['asks'][:depth] == results[name]['asks']
+
+
+main()
@@ -0,0 +1,67 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.future import Future  # noqa: E402
+
+# a watch_tickers-like loop over 500 message hashes, every iteration waits for the next
+# update of any of them, with the previous asyncio.wait based race, the callback based
+# race and the FanIn used by watch_multiple that keeps its callbacks between iterations
+
+num_hashes = 500
+iterations = 20000
+url = 'wss://example.com/ws'
+
+
+def wait_race(futures):
+    # the previous implementation, kept here as the baseline
+    future = Future()
+    for f in futures:
+        f.is_race_future = True
+    task = asyncio.create_task(asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED))
+
+    def callback(done):
+        complete, _ = done.result()
+        first = list(complete)[0]
+        future.set_result(first.result())
+    task.add_done_callback(callback)
+    return future
+
+
+async def run(exchange, name, message_hashes):
+    client = exchange.client(url)
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(iterations):
+        if name == 'asyncio.wait race':
+            future = wait_race([client.future(message_hash) for message_hash in message_hashes])
+        elif name == 'callback race':
+            future = Future.race([client.future(message_hash) for message_hash in message_hashes])
+        else:
+            future = exchange.watch_multiple(url, message_hashes)
+        message_hash = rng.choice(message_hashes)
+        client.resolve(i, message_hash)
+        assert await future == i
+    return time.perf_counter() - start
+
+
+async def main():
+    message_hashes = ['ticker:' + str(i) + '/USDT' for i in range(num_hashes)]
+    print(f'{num_hashes} message hashes, {iterations} updates')
+    for name in ('asyncio.wait race', 'callback race', 'watch_multiple'):
+        exchange = ccxt.pro.binance()
+        exchange.client(url).connected.resolve(url)
+        elapsed = await run(exchange, name, message_hashes)
+        print(f'{name:<20} {elapsed * 1000:9.1f}ms {iterations / elapsed:10,.0f} updates/s')
+        await exchange.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,109 @@
+import os
+import sys
+import random
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base.ws.order_book import OrderBook, ArrayOrderBook, LazyOrderBook  # noqa: E402
+
+
+order_book_input = {
+    'bids': [[10, 10], [9.1, 11], [8.2, 12], [7.3, 13], [6.4, 14], [4.5, 13], [4.5, 0]],
+    'asks': [[16.6, 10], [15.5, 11], [14.4, 12], [13.3, 13], [12.2, 14], [11.1, 13]],
+    'timestamp': 1574827239000,
+    'nonce': 69,
+    'symbol': None,
+}
+
+order_book_target = {
+    'bids': [[10, 10], [9.1, 11], [8.2, 12], [7.3, 13], [6.4, 14]],
+    'asks': [[11.1, 13], [12.2, 14], [13.3, 13], [14.4, 12], [15.5, 11], [16.6, 10]],
+    'timestamp': 1574827239000,
+    'datetime': '2019-11-27T04:00:39.000Z',
+    'nonce': 69,
+    'symbol': None,
+}
+
+limited_order_book_target = {
+    'bids': [[10, 10], [9.1, 11], [8.2, 12], [7.3, 13], [6.4, 14]],
+    'asks': [[11.1, 13], [12.2, 14], [13.3, 13], [14.4, 12], [15.5, 11]],
+    'timestamp': 1574827239000,
+    'datetime': '2019-11-27T04:00:39.000Z',
+    'nonce': 69,
+    'symbol': None,
+}
+
+order_book = ArrayOrderBook(order_book_input)
+order_book.limit()
+assert order_book == order_book_target
+
+limited = ArrayOrderBook(order_book_input, 5)
+limited.limit()
+assert limited == limited_order_book_target
+
+# the depth only bounds the view, deeper levels move up when the top is removed
+limited['asks'].store(11.1, 0)
+limited.limit()
+assert limited['asks'] == [[12.2, 14], [13.3, 13], [14.4, 12], [15.5, 11], [16.6, 10]]
+
+bids = order_book['bids']
+bids.store(1000, 0)
+bids.store(3, 4)
+assert bids[-1] == [3, 4]
+assert len(bids) == 6
+bids.store(3, 0)
+order_book.limit()
+assert order_book == order_book_target
+
+order_book.reset(limited_order_book_target)
+order_book.limit()
+assert order_book == limited_order_book_target
+
+# replay random deltas against the list-backed side and compare
+
+rng = random.Random(42)
+reference = OrderBook({})
+array_book = ArrayOrderBook({}, 50)
+for i in range(20000):
+    key = 'bids' if rng.random() < 0.5 else 'asks'
+    mid = 1000 if key == 'bids' else 1001
+    offset = rng.randint(0, 200) / 10
+    price = mid - offset if key == 'bids' else mid + offset
+    size = 0 if rng.random() < 0.3 else rng.randint(1, 100) / 4
+    reference[key].store(price, size)
+    array_book[key].store(price, size)
+    if i % 100 == 0:
+        reference.limit()
+        array_book.limit()
+        assert array_book['bids'] == reference['bids'][:50]
+        assert array_book['asks'] == reference['asks'][:50]
+        assert array_book['bids'][:5] == reference['bids'][:5]
+        assert len(array_book['asks']) == min(len(reference['asks']), 50)
+
+# the lazy book only builds the levels that are read
+
+rng = random.Random(42)
+reference = OrderBook({})
+lazy_book = LazyOrderBook({}, 50)
+for i in range(20000):
+    key = 'bids' if rng.random() < 0.5 else 'asks'
+    mid = 1000 if key == 'bids' else 1001
+    offset = rng.randint(0, 200) / 10
+    price = mid - offset if key == 'bids' else mid + offset
+    size = 0 if rng.random() < 0.3 else rng.randint(1, 100) / 4
+    reference[key].store(price, size)
+    lazy_book[key].store(price, size)
+    if i % 100 == 99:
+        lazy_book.limit()
+        assert lazy_book['bids'][0] == reference['bids'][0]
+        if i < 1000:
+            # nothing below the top of the bids has been read yet
+            assert list.__len__(lazy_book['bids']) == 1
+        assert lazy_book['asks'][:3] == reference['asks'][:3]
+        assert len(lazy_book['asks']) == min(len(reference['asks']), 50)
+    if i % 1000 == 999:
+        assert lazy_book['bids'][-1] == reference['bids'][:50][-1]
+        assert lazy_book == {**reference, 'bids': reference['bids'][:50], 'asks': reference['asks'][:50]}
@@ -0,0 +1,91 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from aiohttp.http_websocket import WebSocketReader  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+if not hasattr(WebSocketReader, 'parse_frame'):
+    print('the fast client does not support the websocket reader of aiohttp ' + aiohttp.__version__)
+    sys.exit(0)
+
+messages = 2000
+
+
+async def websocket(request):
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    # the burst starts after the subscription, once the client reads from the socket
+    await ws.receive()
+    for i in range(messages):
+        await ws.send_str('{"i":' + str(i) + '}')
+    await ws.receive()
+    return ws
+
+
+async def receive(url, ws_options):
+    exchange = ccxt.pro.binance({'options': {'ws': ws_options}})
+    received = []
+
+    def handle_message(client, message):
+        received.append(message['i'])
+        if len(received) == messages or received[-1] == messages - 1:
+            client.resolve(received, 'done')
+
+    exchange.handle_message = handle_message
+    exchange.open()
+    client = exchange.client(url)
+    done = client.future('done')
+    await client.connect(exchange.session, 0)
+    await client.send({'method': 'SUBSCRIBE'})
+    try:
+        await asyncio.wait_for(done, 10)
+    finally:
+        await exchange.close()
+    return client, received
+
+
+async def test_backpressure():
+    app = web.Application()
+    app.router.add_get('/ws', websocket)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = 'ws://127.0.0.1:' + str(port) + '/ws'
+    # nothing is lost while the socket is paused
+    client, received = await receive(url, {'highWaterMark': 20, 'overflowPolicy': 'pause'})
+    stats = client.queue_stats()
+    assert received == list(range(messages))
+    assert stats['pauses'] > 0
+    assert stats['handled'] >= messages  # and the pongs
+    assert stats['dropped'] == 0
+    # the oldest messages are dropped, the latest one is always handled
+    client, received = await receive(url, {'highWaterMark': 20, 'overflowPolicy': 'dropOldest'})
+    stats = client.queue_stats()
+    assert received[-1] == messages - 1
+    assert stats['maxDepth'] == 20
+    assert stats['dropped'] == messages - len(received)
+    assert stats['dropped'] > 0
+    # the pending futures are rejected
+    try:
+        await receive(url, {'highWaterMark': 20, 'overflowPolicy': 'raise'})
+        assert False
+    except ccxt.NetworkError as e:
+        assert 'highWaterMark' in str(e)
+    # unbounded by default
+    client, received = await receive(url, {})
+    assert received == list(range(messages))
+    assert client.queue_stats()['maxDepth'] > 20
+    await runner.cleanup()
+
+
+asyncio.run(test_backpressure())
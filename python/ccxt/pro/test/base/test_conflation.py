@@ -0,0 +1,75 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+async def test_conflation():
+    exchange = ccxt.pro.binance({
+        'options': {
+            'ws': {
+                'conflation': {
+                    'ticker:': 0,
+                    'orderbook:': 50,
+                },
+            },
+        },
+    })
+    client = exchange.client(url)
+    # latest only, the burst is delivered once with the freshest result
+    future = client.future('ticker:BTC/USDT')
+    for i in range(100):
+        client.resolve(i, 'ticker:BTC/USDT')
+    assert not future.done()
+    assert await future == 99
+    assert client.conflated_messages['ticker:BTC/USDT'] == 99
+    # coalesce 50 ms, the first result goes out right away
+    future = client.future('orderbook:BTC/USDT')
+    client.resolve(0, 'orderbook:BTC/USDT')
+    assert await future == 0
+    future = client.future('orderbook:BTC/USDT')
+    for i in range(1, 10):
+        client.resolve(i, 'orderbook:BTC/USDT')
+    assert not future.done()
+    await asyncio.sleep(0.01)
+    assert not future.done()
+    assert await asyncio.wait_for(future, 1) == 9
+    assert client.conflated_messages['orderbook:BTC/USDT'] == 8
+    # the counts are reported with the ws stats
+    assert exchange.ws_stats()[url]['conflated'] == {'ticker:BTC/USDT': 99, 'orderbook:BTC/USDT': 8}
+    text = exchange.ws_stats_prometheus()
+    assert '# TYPE ccxt_ws_conflated_messages_total counter' in text
+    assert 'ccxt_ws_conflated_messages_total{exchange="binance",url="' + url + '",message_hash="ticker:BTC/USDT"} 99' in text
+    # other subscriptions are not conflated
+    future = client.future('trade:BTC/USDT')
+    client.resolve(1, 'trade:BTC/USDT')
+    assert future.done()
+    # the fast client delivers the latest result once its stack is drained
+    client.callback_scheduled = True
+    client.schedule_flush()
+    assert client.flush_scheduled
+    client.callback_scheduled = False
+    client.flush_scheduled = False
+    # pending results are dropped with the connection
+    future = client.future('ticker:ETH/USDT')
+    client.resolve(1, 'ticker:ETH/USDT')
+    client.reset(ccxt.NetworkError('closed'))
+    try:
+        await future
+        assert False
+    except ccxt.NetworkError:
+        pass
+    await asyncio.sleep(0)
+    assert not client.conflated
+    await exchange.close()
+
+
+asyncio.run(test_conflation())
@@ -0,0 +1,67 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.future import Future  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+async def test_fan_in():
+    exchange = ccxt.pro.binance()
+    client = exchange.client(url)
+    client.connected.resolve(url)
+    hashes = ['a', 'b', 'c']
+    future = exchange.watch_multiple(url, hashes)
+    client.resolve(1, 'b')
+    assert await future == 1
+    # only the resolved hash gets a new future and a new callback
+    pending = client.futures['a']
+    future = exchange.watch_multiple(url, hashes)
+    assert client.futures['a'] is pending
+    assert len(pending._callbacks) == 1
+    client.resolve(2, 'a')
+    assert await future == 2
+    # a caller timing out does not cancel the future of the others
+    first = exchange.watch_multiple(url, hashes)
+    second = exchange.watch_multiple(url, hashes)
+    try:
+        await asyncio.wait_for(first, 0.01)
+        assert False
+    except asyncio.TimeoutError:
+        pass
+    client.resolve(3, 'c')
+    assert await second == 3
+    # errors are propagated
+    future = exchange.watch_multiple(url, hashes)
+    client.reject(ccxt.NetworkError('error'), 'a')
+    try:
+        await future
+        assert False
+    except ccxt.NetworkError:
+        pass
+    # canceling all the futures means the connection was closed by the user
+    future = exchange.watch_multiple(url, hashes)
+    for message_hash in hashes:
+        client.futures[message_hash].cancel()
+    try:
+        await future
+        assert False
+    except ccxt.ExchangeClosedByUser:
+        pass
+    # Future.race
+    futures = [Future(), Future()]
+    race = Future.race(futures)
+    futures[1].resolve('x')
+    assert await race == 'x'
+    assert not futures[0]._callbacks
+    await exchange.close()
+
+
+asyncio.run(test_fan_in())
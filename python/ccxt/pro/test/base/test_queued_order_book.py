@@ -0,0 +1,106 @@
+import os
+import sys
+import random
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.order_book import IndexedOrderBook, QueuedOrderBook  # noqa: E402
+
+
+indexed_order_book_input = {
+    'bids': [[10, 10, '1234'], [9.1, 11, '1235'], [8.2, 12, '1236'], [7.3, 13, '1237'], [6.4, 14, '1238'], [4.5, 13, '1239']],
+    'asks': [[16.6, 10, '1240'], [15.5, 11, '1241'], [14.4, 12, '1242'], [13.3, 13, '1243'], [12.2, 14, '1244'], [11.1, 13, '1244']],
+    'timestamp': 1574827239000,
+    'nonce': 69,
+    'symbol': None,
+}
+
+indexed_order_book_target = {
+    'bids': [[10, 10, '1234'], [9.1, 11, '1235'], [8.2, 12, '1236'], [7.3, 13, '1237'], [6.4, 14, '1238'], [4.5, 13, '1239']],
+    'asks': [[11.1, 13, '1244'], [13.3, 13, '1243'], [14.4, 12, '1242'], [15.5, 11, '1241'], [16.6, 10, '1240']],
+    'timestamp': 1574827239000,
+    'datetime': '2019-11-27T04:00:39.000Z',
+    'nonce': 69,
+    'symbol': None,
+}
+
+order_book = QueuedOrderBook(indexed_order_book_input)
+order_book.limit()
+assert order_book == indexed_order_book_target
+
+limited = QueuedOrderBook(indexed_order_book_input, 5)
+limited.limit()
+assert limited['bids'] == indexed_order_book_target['bids'][:5]
+# the depth only bounds the view, deeper orders move up when the top is removed
+limited['bids'].store(10, 0, '1234')
+limited.limit()
+assert limited['bids'] == indexed_order_book_target['bids'][1:]
+
+bids = order_book['bids']
+bids.store(1000, 0, '12345')
+assert order_book == indexed_order_book_target
+# orders at the same price are kept in arrival order, not sorted by id
+bids.store(10, 2, '1231')
+bids.store(10, 1, '1200')
+assert bids[:3] == [[10, 10, '1234'], [10, 2, '1231'], [10, 1, '1200']]
+# a size update keeps the place in the queue, a price change moves to the back
+bids.store(10, 5, '1234')
+bids.store(None, 3, '1231')
+assert bids[:3] == [[10, 5, '1234'], [10, 3, '1231'], [10, 1, '1200']]
+bids.store(9.1, 1, '1234')
+assert bids[:4] == [[10, 3, '1231'], [10, 1, '1200'], [9.1, 11, '1235'], [9.1, 1, '1234']]
+bids.store(10, 0, '1231')
+bids.store(10, 0, '1200')
+bids.store(9.1, 0, '1234')
+assert bids[0] == [9.1, 11, '1235']
+assert len(bids) == 5
+order_book.limit()
+assert order_book['bids'] == indexed_order_book_target['bids'][1:]
+
+order_book.reset(indexed_order_book_input)
+order_book.limit()
+assert order_book == indexed_order_book_target
+
+# opt-in through the ws options of the exchange
+
+exchange = ccxt.pro.binance()
+assert type(exchange.indexed_order_book()) is IndexedOrderBook
+exchange = ccxt.pro.binance({'options': {'ws': {'indexedOrderBookStorage': 'queue'}}})
+assert type(exchange.indexed_order_book({}, 10)) is QueuedOrderBook
+
+# replay random orders against a list of queues and compare
+
+rng = random.Random(42)
+book = QueuedOrderBook({}, 50)
+reference = {'bids': {}, 'asks': {}}
+for i in range(20000):
+    key = 'bids' if rng.random() < 0.5 else 'asks'
+    order_id = rng.randint(0, 2000)
+    orders = reference[key]
+    if order_id in orders and rng.random() < 0.4:
+        price = orders[order_id][0] if rng.random() < 0.5 else None
+        size = 0 if rng.random() < 0.5 else rng.randint(1, 100)
+    else:
+        price = (1000 - rng.randint(0, 30)) if key == 'bids' else (1001 + rng.randint(0, 30))
+        size = rng.randint(1, 100)
+    book[key].store(price, size, order_id)
+    if not size:
+        orders.pop(order_id, None)
+    elif order_id in orders and (price is None or orders[order_id][0] == price):
+        orders[order_id] = [orders[order_id][0], size, order_id]
+    elif price is not None:
+        orders.pop(order_id, None)
+        orders[order_id] = [price, size, order_id]
+    if i % 7 == 0:
+        assert book[key][0] == sorted(orders.values(), key=lambda order: -order[0] if key == 'bids' else order[0])[0]
+    if i % 100 == 0:
+        book.limit()
+        for side in ('bids', 'asks'):
+            # sorted is stable, so the orders at one price stay in arrival order
+            expected = sorted(reference[side].values(), key=lambda order: -order[0] if side == 'bids' else order[0])
+            assert book[side] == expected[:50]
+            assert len(book[side]) == min(len(expected), 50)
@@ -0,0 +1,127 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from aiohttp.http_websocket import WebSocketReader  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+
+def test_order_books_are_kept():
+    exchange = ccxt.pro.binance()
+    exchange.spawn = lambda *args: None
+    client = exchange.client('wss://example.com/ws')
+    client.subscriptions['btcusdt@depth'] = {'id': '1', 'name': 'depth', 'symbol': 'BTC/USDT', 'limit': 100}
+    client.subscriptions['btcusdt@trade'] = True
+    orderbook = exchange.order_book({'bids': [[1, 1]], 'asks': [[2, 1]], 'nonce': 10}, 100)
+    orderbook.cache.append({'u': 9})
+    exchange.orderbooks['BTC/USDT'] = orderbook
+    exchange.on_reconnected(client)
+    assert orderbook['nonce'] is None
+    assert orderbook.cache == []
+    assert orderbook['bids'] == [[1, 1]]
+    # the replayed subscription does not replace the order book
+    exchange.handle_order_book_subscription(client, {}, client.subscriptions['btcusdt@depth'])
+    assert exchange.orderbooks['BTC/USDT'] is orderbook
+    # but a new subscription still starts with an empty one
+    orderbook['nonce'] = 11
+    exchange.handle_order_book_subscription(client, {}, client.subscriptions['btcusdt@depth'])
+    assert exchange.orderbooks['BTC/USDT'] is not orderbook
+
+
+async def test_reconnect():
+    connections = []
+    subscribe_messages = []
+
+    async def websocket(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connections.append(ws)
+        message = await ws.receive()
+        subscribe_messages.append(json.loads(message.data))
+        for i in range(3):
+            await ws.send_str(json.dumps({'e': 'tick', 'v': len(connections) * 10 + i}))
+        if len(connections) < 3:
+            # drop the first two connections without a close frame
+            await asyncio.sleep(0.05)
+            request.transport.abort()
+        else:
+            await ws.receive()
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/ws', websocket)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = 'ws://127.0.0.1:' + str(port) + '/ws'
+    exchange = ccxt.pro.binance({
+        'options': {
+            'ws': {
+                'reconnect': True,
+                'reconnectDelay': 10,
+            },
+        },
+    })
+    reconnected = []
+    exchange.on_reconnected = lambda client: reconnected.append(client)
+
+    def handle_message(client, message):
+        client.resolve(message['v'], 'tick')
+
+    exchange.handle_message = handle_message
+    exchange.open()
+    client = exchange.client(url)
+    values = []
+    while not values or values[-1] < 30:
+        values.append(await asyncio.wait_for(exchange.watch(url, 'tick', {'method': 'SUBSCRIBE', 'id': 1}, 'tick'), 5))
+    # the same client and future survive the disconnects and the subscription is replayed
+    assert exchange.clients[url] is client
+    assert len(connections) == 3
+    assert subscribe_messages == [{'method': 'SUBSCRIBE', 'id': 1}] * 3
+    assert reconnected == [client, client]
+    assert client.reconnectAttempts == 0
+    assert values[0] == 10
+    await exchange.close()
+    # no reconnect after the exchange is closed
+    await asyncio.sleep(0.1)
+    assert len(connections) == 3
+    # the futures are rejected once the attempts run out
+    await runner.cleanup()
+    exchange = ccxt.pro.binance({
+        'options': {
+            'ws': {
+                'reconnect': True,
+                'reconnectDelay': 1,
+                'maxReconnectAttempts': 2,
+            },
+        },
+    })
+    client = exchange.client(url)
+    client.reconnecting = True
+    client.connected.resolve(url)
+    future = exchange.watch(url, 'tick')
+    client.on_error(ccxt.NetworkError('down'))
+    try:
+        await asyncio.wait_for(future, 5)
+        assert False
+    except ccxt.NetworkError:
+        pass
+    assert url not in exchange.clients
+    await exchange.close()
+
+
+test_order_books_are_kept()
+if hasattr(WebSocketReader, 'parse_frame'):
+    asyncio.run(test_reconnect())
+else:
+    print('the fast client does not support the websocket reader of aiohttp ' + aiohttp.__version__)
@@ -0,0 +1,104 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import aiohttp  # noqa: E402
+from aiohttp import web  # noqa: E402
+from aiohttp.http_websocket import WebSocketReader  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+def subscribe(exchange, subscribe_hash):
+    shard = exchange.shard_url(url, [subscribe_hash])
+    exchange.connection(shard).subscriptions[subscribe_hash] = True
+    return shard
+
+
+async def test_sharding():
+    exchange = ccxt.pro.binance({'options': {'ws': {'sharding': {'maxSubscriptions': 2, 'maxConnections': 3}}}})
+    assert subscribe(exchange, 'a') == url
+    assert subscribe(exchange, 'b') == url
+    assert subscribe(exchange, 'c') == url + '#1'
+    assert exchange.shard_url(url, ['a']) == url
+    assert exchange.shard_url(url, ['c']) == url + '#1'
+    assert subscribe(exchange, 'd') == url + '#1'
+    assert subscribe(exchange, 'e') == url + '#2'
+    assert exchange.shard_url(url, ['x', 'e']) == url + '#2'
+    subscribe(exchange, 'f')
+    try:
+        exchange.shard_url(url, ['g'])
+        assert False
+    except ccxt.ExchangeError:
+        pass
+    # a dropped connection frees its name
+    del exchange.clients[url + '#1']
+    assert subscribe(exchange, 'g') == url + '#1'
+    await exchange.close()
+    # the least busy connection gets the next subscription, a busy one gets company
+    exchange = ccxt.pro.binance({'options': {'ws': {'sharding': {'maxMessagesPerSecond': 10}}}})
+    busy = exchange.connection(exchange.shard_url(url, ['a']))
+    busy.subscriptions['a'] = True
+    busy.connectionEstablished = exchange.milliseconds() - 1000
+    busy.message_count = 100
+    assert subscribe(exchange, 'b') == url + '#1'
+    assert subscribe(exchange, 'c') == url + '#1'
+    await exchange.close()
+    # a url that is authenticated on its connection with client() keeps the new subscriptions on it
+    exchange = ccxt.pro.binance({'options': {'ws': {'sharding': {'maxSubscriptions': 1}}}})
+    assert subscribe(exchange, 'a') == url
+    assert subscribe(exchange, 'b') == url + '#1'
+    exchange.client(url).subscriptions['authenticated'] = True
+    assert subscribe(exchange, 'orders') == url
+    assert subscribe(exchange, 'balance') == url
+    assert exchange.shard_url(url, ['b']) == url + '#1'
+    assert exchange.shard_url('wss://example.com/public', ['c']) == 'wss://example.com/public'
+    await exchange.close()
+    # disabled by default
+    exchange = ccxt.pro.binance()
+    assert subscribe(exchange, 'a') == url
+    assert subscribe(exchange, 'b') == url
+    await exchange.close()
+
+
+async def test_connections():
+    paths = []
+
+    async def websocket(request):
+        paths.append(request.path_qs)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.receive()
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/ws', websocket)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    local_url = 'ws://127.0.0.1:' + str(port) + '/ws'
+    exchange = ccxt.pro.binance({'options': {'ws': {'sharding': {'maxSubscriptions': 2}}}})
+    futures = [exchange.watch(local_url, subscribe_hash, None, subscribe_hash) for subscribe_hash in ['a', 'b', 'c', 'd', 'e']]
+    await asyncio.gather(*[client.connected for client in exchange.clients.values()])
+    # the fragment of the other connections is not sent to the server
+    assert sorted(exchange.clients) == [local_url, local_url + '#1', local_url + '#2']
+    assert paths == ['/ws'] * 3
+    assert exchange.clients[local_url + '#1'].futures.keys() == {'c', 'd'}
+    await exchange.close()
+    await asyncio.gather(*futures, return_exceptions=True)
+    await runner.cleanup()
+
+
+asyncio.run(test_sharding())
+if hasattr(WebSocketReader, 'parse_frame'):
+    asyncio.run(test_connections())
+else:
+    print('the fast client does not support the websocket reader of aiohttp ' + aiohttp.__version__)
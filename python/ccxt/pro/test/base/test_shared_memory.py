@@ -0,0 +1,150 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import multiprocessing  # noqa: E402
+import time  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+from ccxt.async_support.base.ws.shared_memory import SharedSegment, SharedMemoryRunner  # noqa: E402
+
+updates = 20000
+
+
+class StubExchange(ccxt.pro.Exchange):
+    # streams the updates of write_levels() without a connection
+    id = 'stub'
+
+    async def stream_order_book(self, symbol, limit=None, params={}, conflate=True):
+        for i in range(1, updates + 1):
+            yield {'bids': [[i, i]] * 5, 'asks': [[i, i]] * 5, 'timestamp': i, 'nonce': i}
+            await asyncio.sleep(0)
+        await asyncio.Future()
+
+    async def stream_ticker(self, symbol, params={}, maxsize=1000):
+        yield {'timestamp': 1700000000000, 'bid': 100.5, 'ask': 101, 'last': None}
+        await asyncio.Future()
+
+
+# registered when the module is imported, so the spawned workers that import it find it as well
+ccxt.pro.stub = StubExchange
+
+
+def write_levels(name, done):
+    # every level of an update has the same price and amount
+    segment = SharedSegment(name)
+    for i in range(1, updates + 1):
+        segment.write_order_book('BTC/USDT', {'bids': [[i, i]] * 5, 'asks': [[i, i]] * 5, 'nonce': i})
+    done.set()
+    segment.close()
+
+
+def test_segment():
+    segment = SharedSegment(None, ['BTC/USDT', 'ETH/USDT'], ['BTC/USDT'], depth=3, create=True)
+    reader = SharedSegment(segment.name)
+    assert reader.depth == 3
+    assert reader.order_book('BTC/USDT') is None
+    assert reader.ticker('BTC/USDT') is None
+    orderbook = OrderBook({
+        'bids': [[100, 1], [99, 2], [98, 3], [97, 4]],
+        'asks': [[101, 1]],
+        'timestamp': 1700000000000,
+        'nonce': 12345,
+    })
+    segment.write_order_book('BTC/USDT', orderbook)
+    assert reader.order_book('BTC/USDT') == {
+        'symbol': 'BTC/USDT',
+        'bids': [[100, 1], [99, 2], [98, 3]],
+        'asks': [[101, 1]],
+        'timestamp': 1700000000000,
+        'nonce': 12345,
+        'sequence': 1,
+    }
+    assert reader.order_book('ETH/USDT') is None
+    segment.write_ticker('BTC/USDT', {'timestamp': 1700000000001, 'bid': 100.5, 'ask': 101, 'last': None})
+    ticker = reader.ticker('BTC/USDT')
+    assert ticker['timestamp'] == 1700000000001
+    assert ticker['bid'] == 100.5
+    assert ticker['last'] is None
+    assert ticker['sequence'] == 1
+    reader.close()
+    segment.close()
+    segment.unlink()
+
+
+def test_concurrent_reader():
+    context = multiprocessing.get_context('spawn')
+    segment = SharedSegment(None, ['BTC/USDT'], depth=5, create=True)
+    done = context.Event()
+    writer = context.Process(target=write_levels, args=(segment.name, done))
+    writer.start()
+    last = 0
+    reads = 0
+    while not done.is_set() or last < updates:
+        orderbook = segment.order_book('BTC/USDT')
+        if orderbook is None:
+            continue
+        nonce = orderbook['nonce']
+        # a torn read would mix the levels of two updates
+        assert orderbook['bids'] == [[nonce, nonce]] * 5, orderbook
+        assert orderbook['asks'] == [[nonce, nonce]] * 5, orderbook
+        assert orderbook['sequence'] == nonce
+        assert nonce >= last
+        last = nonce
+        reads += 1
+    writer.join()
+    assert last == updates
+    assert reads > 0
+    segment.close()
+    segment.unlink()
+
+
+def test_runner():
+    runner = SharedMemoryRunner()
+    name = runner.add_worker('stub', {}, ['BTC/USDT'], ['ETH/USDT'], depth=5)
+    assert runner.names() == [name]
+    reader = SharedSegment(name)
+    assert reader.depth == 5
+    assert runner.order_book('BTC/USDT') is None
+    assert runner.ticker('ETH/USDT') is None
+    runner.start()
+    # the worker process writes, this process reads the segment attached by name
+    deadline = time.monotonic() + 60
+    last = 0
+    while last < updates:
+        assert time.monotonic() < deadline, last
+        orderbook = reader.order_book('BTC/USDT')
+        if orderbook is None:
+            continue
+        nonce = orderbook['nonce']
+        assert orderbook['bids'] == [[nonce, nonce]] * 5, orderbook
+        assert orderbook['asks'] == [[nonce, nonce]] * 5, orderbook
+        assert orderbook['timestamp'] == nonce
+        assert nonce >= last
+        last = nonce
+    assert runner.order_book('BTC/USDT')['nonce'] == updates
+    while reader.ticker('ETH/USDT') is None:
+        assert time.monotonic() < deadline
+    ticker = runner.ticker('ETH/USDT')
+    assert ticker['bid'] == 100.5
+    assert ticker['last'] is None
+    reader.close()
+    runner.stop()
+    try:
+        segment = SharedSegment(name)
+        segment.close()
+        segment.unlink()
+        assert False
+    except FileNotFoundError:
+        pass
+
+
+if __name__ == '__main__':
+    test_segment()
+    test_concurrent_reader()
+    test_runner()
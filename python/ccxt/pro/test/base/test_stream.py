@@ -0,0 +1,113 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.order_book import OrderBook  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+class exchange_class(ccxt.pro.binance):
+    async def watch_test(self, symbol):
+        return await self.watch(url, 'test:' + symbol, None, 'test:' + symbol)
+
+    async def watch_test_multiple(self, symbols):
+        return await self.watch_multiple(url, ['test:' + symbol for symbol in symbols], None, ['test:' + symbol for symbol in symbols])
+
+    async def watch_order_book(self, symbol, limit=None, params={}):
+        orderbook = await self.watch(url, 'orderbook:' + symbol, None, 'orderbook:' + symbol)
+        return orderbook.limit()
+
+
+async def test_stream():
+    exchange = exchange_class()
+    client = exchange.client(url)
+    # pretend to be connected
+    client.connected.resolve(url)
+    received = []
+
+    async def consume(stream):
+        async for update in stream:
+            received.append(update)
+            # a slow consumer
+            await asyncio.sleep(0.01)
+
+    consumer = asyncio.ensure_future(consume(exchange.stream_watch('watch_test', 'BTC/USDT')))
+    await asyncio.sleep(0)
+    # every update is delivered even though they arrive faster than they are consumed
+    for i in range(20):
+        client.resolve(i, 'test:BTC/USDT')
+    await asyncio.sleep(0.5)
+    assert received == list(range(20))
+    # watch keeps working next to the stream
+    future = asyncio.ensure_future(exchange.watch_test('BTC/USDT'))
+    await asyncio.sleep(0)
+    client.resolve(20, 'test:BTC/USDT')
+    assert await future == 20
+    await asyncio.sleep(0.05)
+    assert received[-1] == 20
+    # errors end the stream after the queued updates
+    client.resolve(21, 'test:BTC/USDT')
+    client.reject(ccxt.NetworkError('closed'), 'test:BTC/USDT')
+    try:
+        await consumer
+        assert False
+    except ccxt.NetworkError:
+        pass
+    assert received[-1] == 21
+    assert 'test:BTC/USDT' not in client.streams
+
+    # multiple symbols share one stream without racing futures
+    received = []
+    consumer = asyncio.ensure_future(consume(exchange.stream_watch('watch_test_multiple', ['XRP/USDT', 'ETH/USDT'], conflate=True)))
+    await asyncio.sleep(0)
+    client.resolve('a', 'test:XRP/USDT')
+    await asyncio.sleep(0.005)
+    client.resolve('b', 'test:ETH/USDT')
+    client.resolve('c', 'test:XRP/USDT')
+    await asyncio.sleep(0.05)
+    # conflated, the consumer was busy while b was queued
+    assert received == ['a', 'c'], received
+    consumer.cancel()
+
+    # bounded queue
+    received = []
+    consumer = asyncio.ensure_future(consume(exchange.stream_watch('watch_test', 'LTC/USDT', maxsize=5)))
+    await asyncio.sleep(0)
+    for i in range(10):
+        client.resolve(i, 'test:LTC/USDT')
+    try:
+        await consumer
+        assert False
+    except RuntimeError:
+        pass
+
+    # order book stream
+    orderbook = OrderBook({}, 2)
+    snapshots = []
+
+    async def consume_order_book():
+        async for snapshot in exchange.stream_order_book('BTC/USDT'):
+            snapshots.append(snapshot['bids'][:])
+            await asyncio.sleep(0.01)
+
+    consumer = asyncio.ensure_future(consume_order_book())
+    await asyncio.sleep(0)
+    for i in range(5):
+        orderbook['bids'].store(100 + i, 1)
+        client.resolve(orderbook, 'orderbook:BTC/USDT')
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+    assert snapshots[-1] == [[104, 1], [103, 1]]
+    assert len(snapshots) < 5
+    consumer.cancel()
+    await exchange.close()
+
+
+asyncio.run(test_stream())
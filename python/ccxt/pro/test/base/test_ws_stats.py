@@ -0,0 +1,66 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+import ccxt.pro  # noqa: E402
+from ccxt.async_support.base.ws.histogram import Histogram  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(50) is None
+    for value in range(1, 101):
+        histogram.record(value / 10)
+    assert histogram.count == 100
+    assert histogram.max == 10
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(99) == 10
+    histogram.record(20000)
+    assert histogram.counts[-1] == 1
+    assert histogram.percentile(100) == 20000
+
+
+async def test_ws_stats():
+    exchange = ccxt.pro.binance({'options': {'ws': {'instrumentation': True}}})
+    handled = []
+    exchange.handle_message = lambda client, message: handled.append(message)
+    client = exchange.client(url)
+    event_time = int(time.time() * 1000) - 5
+    for _ in range(3):
+        client.handle_text_or_binary_message(json.dumps({'e': 'depthUpdate', 'E': event_time}))
+    client.handle_text_or_binary_message(json.dumps([{'e': '24hrTicker', 'E': event_time}]).encode())
+    client.handle_text_or_binary_message('{"result":null,"id":1}')
+    assert len(handled) == 5
+    stats = exchange.ws_stats()[url]
+    assert stats['handlers']['depthUpdate']['count'] == 3
+    assert stats['handlers']['24hrTicker']['count'] == 1
+    assert stats['handlers']['unknown']['count'] == 1
+    assert stats['latency']['decode']['count'] == 5
+    assert stats['latency']['exchangeLag']['count'] == 4
+    assert stats['latency']['exchangeLag']['max'] >= 5
+    assert stats['stack']['depth'] == 0
+    text = exchange.ws_stats_prometheus()
+    assert '# TYPE ccxt_ws_exchange_lag_milliseconds histogram' in text
+    assert 'ccxt_ws_handler_milliseconds_count{exchange="binance",url="' + url + '",topic="depthUpdate"} 3' in text
+    assert 'ccxt_ws_decode_milliseconds_bucket{exchange="binance",url="' + url + '",le="+Inf"} 5' in text
+    # nothing is recorded by default
+    other = ccxt.pro.binance()
+    other.handle_message = lambda client, message: None
+    other.client(url).handle_text_or_binary_message('{"e":"trade"}')
+    assert other.ws_stats()[url]['handlers'] == {}
+    assert other.ws_stats_prometheus() == ''
+    await exchange.close()
+    await other.close()
+
+
+test_histogram()
+asyncio.run(test_ws_stats())
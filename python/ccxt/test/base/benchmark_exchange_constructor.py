@@ -0,0 +1,37 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import time  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+import ccxt.pro  # noqa: E402
+
+# creates instances of the exchanges with the largest describe(), the first instance
+# of a class computes describe() and the camelcase aliases, the others reuse them
+# usage: python benchmark_exchange_constructor.py [instances]
+
+instances = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+ids = ['binance', 'okx', 'bybit', 'htx', 'gate', 'kucoin', 'bitget', 'coinex']
+
+
+def main():
+    print(f'{instances} instances per class')
+    for package in (ccxt, ccxt.async_support, ccxt.pro):
+        for id in ids:
+            cls = getattr(package, id)
+            start = time.perf_counter()
+            cls()
+            first = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(instances):
+                cls({'apiKey': 'key', 'secret': 'secret'})
+            elapsed = (time.perf_counter() - start) / instances
+            print(f'{cls.__module__:<32} first {first * 1000:7.2f}ms then {elapsed * 1000:6.2f}ms')
+
+
+main()
@@ -0,0 +1,52 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+
+# measures the startup of a fresh interpreter, the exchange classes are imported on
+# first access, so importing ccxt and creating one exchange must stay within budget
+# usage: python benchmark_import.py [runs]
+
+runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+# seconds, the median of the runs is compared
+budgets = [
+    ('import ccxt', 'import ccxt', 1.0),
+    ('import ccxt, ccxt.binance()', 'import ccxt\nccxt.binance()', 1.5),
+    ('import ccxt.async_support', 'import ccxt.async_support', 1.5),
+    ('import ccxt.pro, ccxt.pro.binance()', 'import ccxt.pro\nccxt.pro.binance()', 2.0),
+    ('import ccxt, every exchange', 'import ccxt\nfor id in ccxt.exchanges:\n    getattr(ccxt, id)', None),
+]
+
+script = '''
+import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(code):
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output([sys.executable, '-c', script.format(code)], env=env, cwd=root)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def main():
+    failed = []
+    for name, code, budget in budgets:
+        elapsed = statistics.median(measure(code) for _ in range(runs))
+        limit = '' if budget is None else f' (budget {budget * 1000:.0f}ms)'
+        print(f'{name:<40} {elapsed * 1000:8.1f}ms{limit}')
+        if budget is not None and elapsed > budget:
+            failed.append(name)
+    assert not failed, 'over budget: ' + ', '.join(failed)
+
+
+main()
@@ -0,0 +1,57 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import glob  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+from ccxt.base.json_decoder import decoders, get_json_decoder, decode_quoted_json  # noqa: E402
+
+# decodes the http responses of the static response fixtures with every installed decoder
+# the rest path keeps the numbers quoted, the ws path decodes unquoted json from bytes
+
+runs = 50
+fixtures = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static', 'response', '*.json')
+
+
+def load_bodies():
+    bodies = []
+    for path in sorted(glob.glob(fixtures)):
+        with open(path, encoding='utf-8') as file:
+            content = json.load(file)
+        for results in content['methods'].values():
+            for result in results:
+                if 'httpResponse' in result:
+                    bodies.append(json.dumps(result['httpResponse'], ensure_ascii=False))
+    return bodies
+
+
+def measure(decode, bodies):
+    start = time.perf_counter()
+    for _ in range(runs):
+        for body in bodies:
+            decode(body)
+    return time.perf_counter() - start
+
+
+def main():
+    bodies = load_bodies()
+    raw = [body.encode() for body in bodies]
+    size = sum(len(body) for body in raw) * runs
+    print(f'{len(bodies)} responses, {size / runs / 1024:.0f} KiB, {runs} runs')
+    results = [
+        ('rest json.loads(parse_float=str)', measure(lambda body: json.loads(body, parse_float=str, parse_int=str), bodies)),
+        ('rest decode_quoted_json', measure(decode_quoted_json, bodies)),
+        ('ws json.loads(bytes.decode())', measure(lambda body: json.loads(body.decode()), raw)),
+    ]
+    for name in decoders:
+        results.append(('ws ' + name + ' from bytes', measure(get_json_decoder(name), raw)))
+    for name, elapsed in results:
+        print(f'{name:<36} {elapsed * 1000:9.1f}ms {size / elapsed / 1024 / 1024:8.1f} MiB/s')
+
+
+main()
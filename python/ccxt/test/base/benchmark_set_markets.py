@@ -0,0 +1,54 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import copy  # noqa: E402
+import json  # noqa: E402
+import time  # noqa: E402
+import ccxt  # noqa: E402
+
+# the static market fixtures are repeated with renamed ids and symbols until every
+# exchange has as many markets as the largest venues, then set_markets() loads them
+# and reloads an equal copy of them
+# usage: python benchmark_set_markets.py [markets]
+
+count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+fixtures = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static', 'markets')
+ids = ['binance', 'okx', 'bybit', 'deribit', 'htx', 'kraken']
+
+
+def generate_markets(id):
+    with open(os.path.join(fixtures, id + '.json'), encoding='utf-8') as file:
+        markets = list(json.load(file).values())
+    result = []
+    for i in range(count):
+        market = copy.deepcopy(markets[i % len(markets)])
+        suffix = str(i // len(markets))
+        market['id'] = market['id'] + suffix
+        market['symbol'] = market['symbol'] + suffix
+        market['base'] = market['base'] + suffix
+        result.append(market)
+    return result
+
+
+def measure(exchange, markets):
+    start = time.perf_counter()
+    exchange.set_markets(markets)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f'{count} markets per exchange')
+    for id in ids:
+        markets = generate_markets(id)
+        exchange = getattr(ccxt, id)()
+        first = measure(exchange, copy.deepcopy(markets))
+        same = measure(exchange, copy.deepcopy(markets))
+        print(f'{id:<10} load {first:8.1f}ms reload {same:8.1f}ms')
+
+
+main()
@@ -0,0 +1,106 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import collections  # noqa: E402
+import gc  # noqa: E402
+import time  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+# queues the same burst of requests on the scheduling Throttler and on the previous
+# implementation that polled the bucket every millisecond, then compares the cpu time
+# spent and how late each request was released compared to its ideal dispatch time
+
+scenarios = [
+    # instances, queued requests per instance, refillRate, cost
+    (1, 1000, 1 / 2, 1),
+    (1, 1000, 1, 0.5),
+    (40, 20, 1 / 100, 1),
+]
+
+
+class PollingThrottler:
+    # the previous implementation, kept here as the baseline
+    def __init__(self, config, loop=None):
+        self.loop = loop
+        self.config = {
+            'refillRate': 1.0,
+            'delay': 0.001,
+            'cost': 1.0,
+            'tokens': 0,
+            'maxCapacity': 2000,
+            'capacity': 1.0,
+        }
+        self.config.update(config)
+        self.queue = collections.deque()
+        self.running = False
+
+    async def looper(self):
+        last_timestamp = time.time() * 1000
+        while self.running:
+            future, cost = self.queue[0]
+            cost = self.config['cost'] if cost is None else cost
+            if self.config['tokens'] >= 0:
+                self.config['tokens'] -= cost
+                if not future.done():
+                    future.set_result(None)
+                self.queue.popleft()
+                await asyncio.sleep(0)
+                if len(self.queue) == 0:
+                    self.running = False
+            else:
+                await asyncio.sleep(self.config['delay'])
+                now = time.time() * 1000
+                elapsed = now - last_timestamp
+                last_timestamp = now
+                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+
+    def __call__(self, cost=None):
+        future = asyncio.Future()
+        self.queue.append((future, cost))
+        if not self.running:
+            self.running = True
+            asyncio.ensure_future(self.looper(), loop=self.loop)
+        return future
+
+
+async def run(cls, instances, requests, refill_rate, cost):
+    throttlers = [cls({'refillRate': refill_rate}) for _ in range(instances)]
+    latencies = []
+    start = None
+
+    async def request(throttler, i):
+        await throttler(cost)
+        # the ideal dispatch time of the i-th request in an empty bucket
+        ideal = i * cost / refill_rate
+        latencies.append((time.perf_counter() - start) * 1000 - ideal)
+
+    tasks = [asyncio.ensure_future(request(throttler, i)) for throttler in throttlers for i in range(requests)]
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    await asyncio.gather(*tasks)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return wall, cpu, latencies
+
+
+async def main():
+    for instances, requests, refill_rate, cost in scenarios:
+        print(f'{instances} instances x {requests} queued requests, refillRate {refill_rate}, cost {cost}')
+        for cls in (PollingThrottler, Throttler):
+            # let the previous run settle
+            gc.collect()
+            await asyncio.sleep(0.5)
+            wall, cpu, latencies = await run(cls, instances, requests, refill_rate, cost)
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[int(len(latencies) * 0.99)]
+            print(f'  {cls.__name__:<16} wall {wall * 1000:8.1f}ms cpu {cpu * 1000:8.1f}ms latency p50 {p50:6.2f}ms p99 {p99:6.2f}ms max {latencies[-1]:6.2f}ms')
+
+
+asyncio.run(main())
@@ -0,0 +1,41 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from aiohttp import web  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+
+
+async def test_connection_reuse():
+    async def handler(request):
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    host = 'http://127.0.0.1:' + str(port)
+    exchange = ccxt.binance({
+        'urls': {'api': {'public': host + '/api/v3'}},
+        'aiohttp_connector_options': {'limit_per_host': 4, 'keepalive_timeout': 60},
+    })
+    assert host in exchange.api_hosts()
+    assert await exchange.warmup(3, [host]) == {host: 3}
+    assert exchange.session.connector.limit_per_host == 4
+    for _ in range(5):
+        await exchange.fetch(host + '/api/v3/time')
+        assert exchange.last_connection_reused is True
+    assert exchange.connection_stats == {'created': 0, 'reused': 5}
+    await exchange.close()
+    await runner.cleanup()
+
+
+asyncio.run(test_connection_reuse())
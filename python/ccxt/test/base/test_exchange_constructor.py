@@ -0,0 +1,46 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from decimal import Decimal  # noqa: E402
+import ccxt  # noqa: E402
+
+
+def test_exchange_constructor():
+    first = ccxt.binance()
+    second = ccxt.binance({'apiKey': 'key', 'options': {'defaultType': 'future'}, 'requests_adapter_options': {'pool_maxsize': 4}})
+    # describe() is computed once per class but every instance gets its own copy
+    assert first.options is not second.options
+    assert first.options['defaultType'] == 'spot'
+    assert second.options['defaultType'] == 'future'
+    assert second.options['defaultNetworkCodeReplacements'] == first.options['defaultNetworkCodeReplacements']
+    first.options['defaultNetworkCodeReplacements']['ETH']['ERC20'] = 'changed'
+    first.urls['api']['public'] = 'changed'
+    first.api['public']['get']['ping'] = 0
+    third = ccxt.binance()
+    assert third.options['defaultNetworkCodeReplacements']['ETH']['ERC20'] == 'ETH'
+    assert second.options['defaultNetworkCodeReplacements']['ETH']['ERC20'] == 'ETH'
+    assert third.urls['api']['public'] != 'changed'
+    assert third.api['public']['get']['ping'] != 0
+    assert first.timeframes is not third.timeframes
+    assert second.apiKey == 'key'
+    assert first.apiKey == ''
+    # camelcase aliases of the methods and of the attributes
+    assert third.fetchOHLCV == third.fetch_ohlcv
+    assert third.publicGetPing == third.public_get_ping
+    assert second.requestsAdapterOptions == {'pool_maxsize': 4}
+    assert third.requestsAdapterOptions == {}
+    # the fees are parsed with the number type of the class
+    ccxt.binance.number = Decimal
+    try:
+        assert isinstance(ccxt.binance().fees['trading']['taker'], Decimal)
+    finally:
+        del ccxt.binance.number
+    assert isinstance(ccxt.binance().fees['trading']['taker'], float)
+
+
+test_exchange_constructor()
@@ -0,0 +1,102 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import datetime  # noqa: E402
+import json  # noqa: E402
+import socket  # noqa: E402
+import tempfile  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+
+try:
+    import httpx  # noqa: F401
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+except ImportError:
+    print('httpx[http2] and hypercorn are required to test the http2 transport')
+    sys.exit(0)
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+
+
+def create_certificate(directory):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = x509.CertificateBuilder() \
+        .subject_name(name) \
+        .issuer_name(name) \
+        .public_key(key.public_key()) \
+        .serial_number(x509.random_serial_number()) \
+        .not_valid_before(now - datetime.timedelta(days=1)) \
+        .not_valid_after(now + datetime.timedelta(days=1)) \
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName('localhost')]), critical=False) \
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True) \
+        .sign(key, hashes.SHA256())
+    certfile = os.path.join(directory, 'cert.pem')
+    keyfile = os.path.join(directory, 'key.pem')
+    with open(certfile, 'wb') as file:
+        file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, 'wb') as file:
+        file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return certfile, keyfile
+
+
+connections = set()
+
+
+async def app(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+    connections.add(scope['client'])
+    if scope['path'] == '/binary':
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/octet-stream')]})
+        await send({'type': 'http.response.body', 'body': bytes(range(256))})
+        return
+    await asyncio.sleep(0.05)
+    body = json.dumps({'httpVersion': scope['http_version'], 'path': scope['path']}).encode()
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'application/json'), (b'x-mbx-used-weight-1m', b'10')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def test_http2_transport():
+    directory = tempfile.mkdtemp()
+    certfile, keyfile = create_certificate(directory)
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    config = Config()
+    config.bind = ['localhost:' + str(port)]
+    config.certfile = certfile
+    config.keyfile = keyfile
+    config.alpn_protocols = ['h2']
+    config.loglevel = 'ERROR'
+    shutdown = asyncio.Event()
+    server = asyncio.ensure_future(serve(app, config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+    host = 'https://localhost:' + str(port)
+    exchange = ccxt.binance({'http2': True, 'cafile': certfile, 'enableLastResponseHeaders': True})
+    assert await exchange.warmup(1, [host]) == {host: 1}
+    responses = await asyncio.gather(*[exchange.fetch(host + '/api/v3/ticker/' + str(i)) for i in range(200)])
+    assert all(response['httpVersion'] == '2' for response in responses)
+    assert [response['path'] for response in responses] == ['/api/v3/ticker/' + str(i) for i in range(200)]
+    # all the concurrent requests are multiplexed on the connection opened by the warmup
+    assert len(connections) == 1
+    assert exchange.last_response_headers['X-Mbx-Used-Weight-1m'] == '10'
+    # a body that is neither json nor text is returned as bytes
+    assert await exchange.fetch(host + '/binary') == bytes(range(256))
+    await exchange.close()
+    assert exchange.transport is None
+    shutdown.set()
+    await server
+
+
+asyncio.run(test_http2_transport())
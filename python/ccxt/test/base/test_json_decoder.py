@@ -0,0 +1,51 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import json  # noqa: E402
+import ccxt  # noqa: E402
+from ccxt.base.json_decoder import decoders, get_json_decoder, decode_quoted_json  # noqa: E402
+from ccxt.async_support.base.ws.functions import is_json_encoded_object  # noqa: E402
+
+body = '{"price":0.10000000000000000001,"amount":12345678901234567890123,"id":9123456789012345678,"ok":true,"side":null}'
+
+assert decode_quoted_json(body) == {'price': '0.10000000000000000001', 'amount': '12345678901234567890123', 'id': '9123456789012345678', 'ok': True, 'side': None}
+assert decode_quoted_json(body.encode()) == decode_quoted_json(body)
+
+for name in decoders:
+    decode = get_json_decoder(name)
+    assert decode(body) == decode(body.encode())
+    assert decode(body)['id'] == 9123456789012345678
+    assert decode('{"a":NaN}')['a'] != 0
+    assert decode(b'[1,"\xc3\xa9"]') == [1, 'é']
+
+# the numbers are decoded like json.loads by default, the fast decoders are opt-in
+numbers = '[12345678901234567890123,-9223372036854775809,9223372036854775807,0.10000000000000000001,123456789.123456789123,1e-8,1E5,-0.0]'
+decoded = get_json_decoder()(numbers)
+assert decoded == json.loads(numbers)
+assert [type(value) for value in decoded] == [int, int, int, float, float, float, float, float]
+assert decoded[0] == 12345678901234567890123
+assert get_json_decoder()(numbers.encode()) == decoded
+assert ccxt.kucoin().json_loads(numbers) == decoded
+for name in decoders:
+    # the integers and the doubles in range are decoded the same by every decoder
+    assert get_json_decoder(name)('[' + numbers[numbers.index('9223372036854775807'):]) == decoded[2:]
+
+exchange = ccxt.kucoin({'json_decoder': 'json'})
+assert exchange.parse_json('{"a":1.5}') == {'a': 1.5}
+exchange = ccxt.binance()
+assert exchange.parse_json('{"a":1.5}') == {'a': '1.5'}
+
+try:
+    get_json_decoder('unknown')
+    assert False
+except ccxt.NotSupported:
+    pass
+
+assert is_json_encoded_object(b'{"a":1}')
+assert is_json_encoded_object(b'[]')
+assert not is_json_encoded_object(b'pong')
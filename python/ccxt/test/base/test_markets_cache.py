@@ -0,0 +1,136 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+fixtures = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+
+with open(os.path.join(fixtures, 'markets', 'binance.json'), encoding='utf-8') as file:
+    markets = list(json.load(file).values())
+with open(os.path.join(fixtures, 'currencies', 'binance.json'), encoding='utf-8') as file:
+    currencies = json.load(file)
+
+
+def create(module, directory, calls, config={}):
+    exchange = module.binance(ccxt.Exchange.extend({'markets_cache_dir': directory}, config))
+
+    def fetch_markets(params={}):
+        calls.append('markets')
+        return markets
+
+    def fetch_currencies(params={}):
+        calls.append('currencies')
+        return currencies
+
+    if module is ccxt:
+        exchange.fetch_markets = fetch_markets
+        exchange.fetch_currencies = fetch_currencies
+    else:
+        async def fetch_markets_async(params={}):
+            return fetch_markets(params)
+
+        async def fetch_currencies_async(params={}):
+            return fetch_currencies(params)
+
+        exchange.fetch_markets = fetch_markets_async
+        exchange.fetch_currencies = fetch_currencies_async
+    return exchange
+
+
+def test_markets_cache():
+    with tempfile.TemporaryDirectory() as directory:
+        calls = []
+        first = create(ccxt, directory, calls)
+        first.load_markets()
+        assert calls == ['currencies', 'markets']
+        assert os.listdir(directory) == [os.path.basename(first.markets_cache_path())]
+        # another instance, or another process, loads the same markets without a request
+        second = create(ccxt, directory, calls)
+        second.load_markets()
+        assert calls == ['currencies', 'markets']
+        assert second.markets == first.markets
+        assert second.currencies == first.currencies
+        assert second.symbols == first.symbols
+        # options that can change the markets use another file
+        other = create(ccxt, directory, calls, {'options': {'fetchMarkets': ['spot']}})
+        other.load_markets()
+        assert calls == ['currencies', 'markets'] * 2
+        assert len(os.listdir(directory)) == 2
+        # a reload always fetches
+        second.load_markets(True)
+        assert calls == ['currencies', 'markets'] * 3
+        # a stale file is used and refreshed in the background
+        stale = create(ccxt, directory, calls, {'markets_cache_ttl': -1})
+        refreshed = []
+        stale.refresh_markets_cache = lambda: refreshed.append(stale.markets)
+        stale.load_markets()
+        assert stale.markets == first.markets
+        assert calls == ['currencies', 'markets'] * 3
+        # the refresh uses its own session and then replaces the markets of the instance
+        sessions = []
+        stale.create_session = lambda: sessions.append(ccxt.Exchange.create_session(stale)) or sessions[-1]
+        stale.update_markets_cache()
+        assert calls == ['currencies', 'markets'] * 4
+        assert len(sessions) == 1 and sessions[0] is not stale.session
+        assert refreshed[0] is not stale.markets
+        assert stale.markets == first.markets
+        # the requests of the refresh are spaced with the requests of the instance
+        refresher = stale.markets_refresher()
+        stale.throttle()
+        start = time.perf_counter()
+        refresher.throttle()
+        assert time.perf_counter() - start >= stale.rateLimit / 1000 * 0.9
+        assert stale.lastRestRequestTimestamp >= stale.milliseconds() - stale.rateLimit
+        refresher.session.close()
+        # a file of another version or a broken file is ignored
+        path = first.markets_cache_path()
+        with open(path, encoding='utf-8') as file:
+            entry = json.load(file)
+        entry['version'] = '0.0.0'
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(entry, file)
+        create(ccxt, directory, calls).load_markets()
+        assert calls == ['currencies', 'markets'] * 5
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('{"format":')
+        create(ccxt, directory, calls).load_markets()
+        assert calls == ['currencies', 'markets'] * 6
+        assert not [name for name in os.listdir(directory) if name.startswith('.')]
+    # disabled by default
+    calls = []
+    exchange = create(ccxt, None, calls)
+    exchange.load_markets()
+    assert exchange.markets_cache_file is None
+
+
+async def test_markets_cache_async():
+    with tempfile.TemporaryDirectory() as directory:
+        calls = []
+        first = create(ccxt.async_support, directory, calls)
+        await first.load_markets()
+        second = create(ccxt.async_support, directory, calls, {'markets_cache_ttl': -1})
+        await second.load_markets()
+        assert second.markets == first.markets
+        # the stale markets are used while a task fetches them again
+        await second.markets_refreshing
+        assert calls == ['currencies', 'markets'] * 2
+        # the sync and async classes share the file
+        sync = create(ccxt, directory, calls)
+        sync.load_markets()
+        assert calls == ['currencies', 'markets'] * 2
+        await first.close()
+        await second.close()
+
+
+test_markets_cache()
+asyncio.run(test_markets_cache_async())
@@ -0,0 +1,67 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+
+
+async def test_rate_limit_headers():
+    exchange = ccxt.binanceusdm({'adaptiveRateLimit': True})
+    fapi = exchange.urls['api']['fapiPublic'] + '/depth'
+    assert exchange.rate_limit_headers_config(fapi)['limit'] == 2400
+    throttle = exchange.throttle
+    static_rate = throttle.config['refillRate']
+    # plenty of quota left, the rate goes up to spread it over the rest of the minute
+    exchange.handle_rate_limit_headers(200, {'X-MBX-USED-WEIGHT-1M': '400'}, fapi)
+    assert throttle.config['refillRate'] > static_rate
+    # the quota is used up, wait until the next minute and continue at the static rate
+    exchange.handle_rate_limit_headers(200, {'X-MBX-USED-WEIGHT-1M': '2400'}, fapi)
+    assert throttle.config['refillRate'] == static_rate
+    wait = -throttle.config['tokens'] / static_rate
+    assert 0 < wait <= 60000
+    # 429 with a retry-after header
+    exchange.handle_rate_limit_headers(429, {'Retry-After': '120'}, fapi)
+    wait = -throttle.config['tokens'] / static_rate
+    assert wait >= 119000
+    pending = asyncio.ensure_future(throttle(1))
+    await asyncio.sleep(0.05)
+    assert not pending.done()
+    pending.cancel()
+    await exchange.close()
+    # spot, sapi and futures responses are matched with the quota of their api
+    exchange = ccxt.binance({'adaptiveRateLimit': True})
+    spot = exchange.urls['api']['public'] + '/depth'
+    assert exchange.rate_limit_headers_config(spot)['scale'] == 0.2
+    assert exchange.rate_limit_headers_config(exchange.urls['api']['sapiV2'] + '/sub-account/futures/account')['limit'] == 12000
+    assert exchange.rate_limit_headers_config(exchange.urls['api']['fapiPrivateV2'] + '/account')['limit'] == 2400
+    assert exchange.rate_limit_headers_config(exchange.urls['api']['papi'] + '/balance') is None
+    # 1500 of the 6000 spot weight used does not hold the queue
+    exchange.handle_rate_limit_headers(200, {'X-MBX-USED-WEIGHT-1M': '1500'}, spot)
+    assert exchange.throttle.config['tokens'] >= 0
+    start = exchange.milliseconds()
+    for _ in range(10):
+        await exchange.throttle(0.2)
+    assert exchange.milliseconds() - start < 500
+    exchange.handle_rate_limit_headers(200, {'X-MBX-USED-WEIGHT-1M': '1500'}, exchange.urls['api']['fapiPublic'] + '/depth')
+    await asyncio.wait_for(exchange.throttle(1), 0.5)
+    await exchange.close()
+    # custom remaining and reset headers
+    exchange = ccxt.binance({'adaptiveRateLimit': True, 'options': {'rateLimitHeaders': {
+        'remaining': 'x-ratelimit-remaining',
+        'reset': 'x-ratelimit-reset',
+        'scale': 2,
+    }}})
+    now = exchange.milliseconds()
+    exchange.handle_rate_limit_headers(200, {'x-ratelimit-remaining': '10', 'x-ratelimit-reset': str(now + 1000)})
+    assert abs(exchange.throttle.config['refillRate'] - 20 / 1000) < 0.001
+    # ignored when the headers are missing
+    exchange.handle_rate_limit_headers(200, {})
+    await exchange.close()
+
+
+asyncio.run(test_rate_limit_headers())
@@ -0,0 +1,44 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import copy  # noqa: E402
+import json  # noqa: E402
+import ccxt  # noqa: E402
+
+fixtures = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static', 'markets')
+
+with open(os.path.join(fixtures, 'binance.json'), encoding='utf-8') as file:
+    markets = list(json.load(file).values())
+
+
+def test_set_markets():
+    exchange = ccxt.binance()
+    exchange.set_markets(copy.deepcopy(markets))
+    btc = exchange.markets['BTC/USDT']
+    eth = exchange.markets['ETH/USDT']
+    # the defaults are copied for every market
+    assert btc['limits'] is not eth['limits']
+    assert btc['limits']['leverage'] is not eth['limits']['leverage']
+    assert btc['precision'] is not exchange.markets['BTC/USDT:USDT']['precision']
+    assert btc['subType'] is None
+    assert exchange.markets['BTC/USDT:USDT']['subType'] == 'linear'
+    # spot markets come first in the markets of an id
+    assert all(values[0]['spot'] or len(values) == 1 for values in exchange.markets_by_id.values())
+    assert exchange.symbols == sorted(exchange.markets)
+    # a reload builds every market again
+    changed = copy.deepcopy(markets)
+    for market in changed:
+        if market['symbol'] == 'ETH/USDT':
+            market['active'] = False
+    exchange.set_markets(changed)
+    assert exchange.markets['BTC/USDT'] is not btc
+    assert exchange.markets['BTC/USDT'] == btc
+    assert exchange.markets['ETH/USDT']['active'] is False
+
+
+test_set_markets()
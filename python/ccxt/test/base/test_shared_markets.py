@@ -0,0 +1,172 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import copy  # noqa: E402
+import json  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from ccxt.base import markets_registry  # noqa: E402
+
+fixtures = os.path.join(os.path.dirname(root), 'ts', 'src', 'test', 'static')
+
+with open(os.path.join(fixtures, 'markets', 'binance.json'), encoding='utf-8') as file:
+    markets = list(json.load(file).values())
+with open(os.path.join(fixtures, 'currencies', 'binance.json'), encoding='utf-8') as file:
+    currencies = json.load(file)
+
+
+def create(module, calls, config={}):
+    exchange = module.binance(ccxt.Exchange.extend({'share_markets': True}, config))
+
+    def fetch_markets(params={}):
+        calls.append('markets')
+        return markets
+
+    def fetch_currencies(params={}):
+        calls.append('currencies')
+        time.sleep(0.01)
+        return currencies
+
+    if module is ccxt:
+        exchange.fetch_markets = fetch_markets
+        exchange.fetch_currencies = fetch_currencies
+    else:
+        async def fetch_markets_async(params={}):
+            return fetch_markets(params)
+
+        async def fetch_currencies_async(params={}):
+            calls.append('currencies')
+            await asyncio.sleep(0.01)
+            return currencies
+
+        exchange.fetch_markets = fetch_markets_async
+        exchange.fetch_currencies = fetch_currencies_async
+    return exchange
+
+
+def test_shared_markets():
+    markets_registry.registry.clear()
+    calls = []
+    first = create(ccxt, calls)
+    first.load_markets()
+    second = create(ccxt, calls)
+    second.load_markets()
+    assert calls == ['currencies', 'markets']
+    assert second.markets == first.markets
+    assert second.currencies == first.currencies
+    assert second.symbols == first.symbols
+    assert second.markets_by_id == first.markets_by_id
+    # the market dicts are shared, the containers are not
+    assert second.markets['BTC/USDT'] is first.markets['BTC/USDT']
+    assert second.markets is not first.markets
+    second.markets['BTC/USDT'] = second.extend(second.markets['BTC/USDT'], {'active': False})
+    assert first.markets['BTC/USDT']['active'] is True
+    assert create(ccxt, calls).load_markets()['BTC/USDT']['active'] is True
+    # the shared markets and currencies are read only, a changed copy replaces them in one instance
+    for change in [
+        lambda: first.markets['BTC/USDT']['precision'].__setitem__('price', 123),
+        lambda: first.markets['BTC/USDT'].update({'active': False}),
+        lambda: first.currencies['BTC']['networks'].clear(),
+        lambda: first.markets_by_id['BTCUSDT'].append({}),
+    ]:
+        try:
+            change()
+            assert False
+        except TypeError:
+            pass
+    assert second.markets['BTC/USDT']['precision'] == first.markets['BTC/USDT']['precision']
+    market = first.deep_extend(first.markets['BTC/USDT'], {'precision': {'price': 123}})
+    market['limits']['amount']['min'] = 5
+    first.markets['BTC/USDT'] = market
+    assert first.market('BTC/USDT')['precision']['price'] == 123
+    assert second.markets['BTC/USDT']['precision']['price'] != 123
+    assert second.markets['BTC/USDT']['limits']['amount']['min'] != 5
+    assert type(copy.deepcopy(second.markets['BTC/USDT'])['precision']) is dict
+    assert json.loads(json.dumps(second.markets['BTC/USDT'])) == second.markets['BTC/USDT']
+    # options that can change the markets are loaded separately
+    create(ccxt, calls, {'options': {'fetchMarkets': ['spot']}}).load_markets()
+    assert calls == ['currencies', 'markets'] * 2
+    # a reload fetches and publishes the markets for the instances that load them later
+    second.load_markets(True)
+    assert calls == ['currencies', 'markets'] * 3
+    assert first.markets['BTC/USDT']['active'] is True
+    # concurrent threads wait for one load
+    markets_registry.registry.clear()
+    calls.clear()
+    exchanges = [create(ccxt, calls) for _ in range(8)]
+    threads = [threading.Thread(target=exchange.load_markets) for exchange in exchanges]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == ['currencies', 'markets']
+    assert all(exchange.symbols == first.symbols for exchange in exchanges)
+    # disabled by default
+    exchange = ccxt.binance()
+    exchange.fetch_markets = create(ccxt, calls).fetch_markets
+    exchange.fetch_currencies = create(ccxt, calls).fetch_currencies
+    exchange.load_markets()
+    assert calls == ['currencies', 'markets'] * 2
+    assert exchange.shared_markets_key is None
+
+
+async def test_shared_markets_async():
+    markets_registry.registry.clear()
+    calls = []
+    exchanges = [create(ccxt.async_support, calls) for _ in range(8)]
+    # one request for all the instances that load the markets at the same time
+    results = await asyncio.gather(*[exchange.load_markets() for exchange in exchanges])
+    assert calls == ['currencies', 'markets']
+    assert all(result['BTC/USDT'] is results[0]['BTC/USDT'] for result in results)
+    await create(ccxt.async_support, calls).load_markets()
+    assert calls == ['currencies', 'markets']
+    # a failed load is not kept
+    failing = create(ccxt.async_support, calls)
+
+    async def fetch_markets(params={}):
+        raise ccxt.NetworkError('down')
+
+    failing.fetch_markets = fetch_markets
+    try:
+        await failing.load_markets(True)
+        assert False
+    except ccxt.NetworkError:
+        pass
+    await exchanges[0].load_markets(True)
+    assert calls == ['currencies', 'markets', 'currencies', 'currencies', 'markets']
+    # an instance that gives up waiting does not cancel the load of the others
+    markets_registry.registry.clear()
+    calls.clear()
+    first = create(ccxt.async_support, calls)
+    second = create(ccxt.async_support, calls)
+
+    async def fetch_markets_slowly(params={}):
+        calls.append('markets')
+        await asyncio.sleep(0.2)
+        return markets
+
+    first.fetch_markets = fetch_markets_slowly
+    pending = asyncio.ensure_future(first.load_markets())
+    await asyncio.sleep(0)
+    try:
+        await asyncio.wait_for(pending, 0.1)
+        assert False
+    except asyncio.TimeoutError:
+        pass
+    loaded = await asyncio.wait_for(second.load_markets(), 1)
+    assert 'BTC/USDT' in loaded
+    assert calls == ['currencies', 'markets']
+    for exchange in exchanges + [first, second]:
+        await exchange.close()
+
+
+test_shared_markets()
+asyncio.run(test_shared_markets_async())
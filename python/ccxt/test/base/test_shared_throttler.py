@@ -0,0 +1,74 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base.throttler import MultiThrottler  # noqa: E402
+
+
+async def test_shared_throttler():
+    first = ccxt.binance({'apiKey': 'key', 'rateLimiterScope': 'apiKey'})
+    second = ccxt.binance({'apiKey': 'key', 'rateLimiterScope': 'apiKey'})
+    other_key = ccxt.binance({'apiKey': 'other', 'rateLimiterScope': 'apiKey'})
+    private = ccxt.binance({'apiKey': 'key'})
+    named = ccxt.binanceusdm({'rateLimiterScope': 'binance-ip'})
+    named_too = ccxt.binance({'rateLimiterScope': 'binance-ip'})
+    assert first.throttle is second.throttle
+    assert first.throttle is not other_key.throttle
+    assert first.throttle is not private.throttle
+    assert named.throttle is named_too.throttle
+    assert first.client('wss://example.com/a').throttle is second.client('wss://example.com/b').throttle
+    assert first.client('wss://example.com/c').throttle is not first.throttle
+    # both instances draw from the same bucket, so the second batch has to wait
+    rate_limit = 20
+    a = ccxt.binance({'rateLimit': rate_limit, 'rateLimiterScope': 'shared-test'})
+    b = ccxt.binance({'rateLimit': rate_limit, 'rateLimiterScope': 'shared-test'})
+    start = time.perf_counter()
+    await asyncio.gather(*[instance.throttle(1) for instance in (a, b) for _ in range(5)])
+    elapsed = (time.perf_counter() - start) * 1000
+    assert elapsed >= 9 * rate_limit - 5, elapsed
+    for exchange in (first, second, other_key, private, named, named_too, a, b):
+        await exchange.close()
+
+
+async def test_buckets():
+    options = {
+        'rateLimiterBuckets': {
+            'orders': {
+                'refillRate': 1 / 1000,
+                'capacity': 1,
+                'methods': ['POST'],
+                'paths': ['order'],
+            },
+        },
+    }
+    exchange = ccxt.binance({'rateLimiterScope': 'buckets-test', 'options': options})
+    assert isinstance(exchange.throttle, MultiThrottler)
+    costs = exchange.calculate_rate_limiter_cost('private', 'POST', 'order', {}, {'cost': 1})
+    assert costs == {'default': 1, 'orders': 1}
+    costs = exchange.calculate_rate_limiter_cost('private', 'GET', 'order', {}, {'cost': 2})
+    assert costs == {'default': 2}
+    costs = exchange.calculate_rate_limiter_cost('sapi', 'GET', 'capital/config/getall', {}, {'cost': 10, 'noCoin': 1})
+    assert costs == {'default': 1}
+    # the order bucket is empty after the first order
+    await exchange.throttle({'default': 1, 'orders': 1})
+    pending = asyncio.ensure_future(exchange.throttle({'default': 1, 'orders': 1}))
+    await asyncio.sleep(0.2)
+    assert not pending.done()
+    assert exchange.throttle.stats()['orders']['queueLength'] == 1
+    pending.cancel()
+    await exchange.close()
+
+
+async def main():
+    await test_shared_throttler()
+    await test_buckets()
+
+
+asyncio.run(main())
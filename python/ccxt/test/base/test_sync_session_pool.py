@@ -0,0 +1,94 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import logging  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+import requests  # noqa: E402
+import ccxt  # noqa: E402
+
+
+connections = set()
+cookies = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        connections.add(self.client_address)
+        if 'Cookie' in self.headers:
+            cookies.append(self.headers['Cookie'])
+        time.sleep(0.01)
+        body = b'{"ok":true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=1; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = 'http://127.0.0.1:' + str(server.server_address[1]) + '/'
+
+discarded = []
+
+
+class DiscardedConnections(logging.Handler):
+    def emit(self, record):
+        if 'Connection pool is full' in record.getMessage():
+            discarded.append(record)
+
+
+logging.getLogger('urllib3.connectionpool').addHandler(DiscardedConnections())
+
+threads = 32
+exchange = ccxt.binance({
+    'requests_adapter_options': {'pool_connections': 1, 'pool_maxsize': threads},
+})
+with ThreadPoolExecutor(threads) as executor:
+    responses = list(executor.map(lambda i: exchange.fetch(url + str(i)), range(400)))
+assert all(response == {'ok': True} for response in responses)
+# every thread returns its connection to the pool instead of closing it
+assert len(connections) <= threads, len(connections)
+assert not discarded
+# the own session does not keep cookies, so no thread sends the cookie of another response
+assert not cookies
+assert len(exchange.session.cookies) == 0
+# a session from the config keeps its cookies, which are cleared before every request
+session = requests.Session()
+exchange = ccxt.binance({'session': session})
+exchange.fetch(url)
+assert len(session.cookies) == 1
+exchange.fetch(url)
+assert not cookies
+
+# the rate limiter spaces the requests of all the threads
+rate_limit = 20
+exchange = ccxt.binance({'rateLimit': rate_limit})
+exchange.lastRestRequestTimestamp = 0
+timestamps = []
+
+
+def throttled(i):
+    exchange.throttle(1)
+    timestamps.append(time.perf_counter())
+
+
+with ThreadPoolExecutor(8) as executor:
+    list(executor.map(throttled, range(16)))
+timestamps.sort()
+assert (timestamps[-1] - timestamps[0]) * 1000 >= 15 * rate_limit - 15
+server.shutdown()
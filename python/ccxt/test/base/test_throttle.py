@@ -106,7 +106,7 @@ async def schedule(case):
 
 
 async def main():
-    await asyncio.wait([schedule(case) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
+    await asyncio.wait([asyncio.ensure_future(schedule(case)) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
 
 
 asyncio.run(main())
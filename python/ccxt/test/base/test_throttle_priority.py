@@ -0,0 +1,76 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+
+async def test_lanes():
+    throttle = Throttler({'refillRate': 1 / 5})
+    order = []
+
+    async def request(name, priority):
+        await throttle(1, priority)
+        order.append(name)
+
+    tasks = [asyncio.ensure_future(request('backfill' + str(i), 3)) for i in range(10)]
+    await asyncio.sleep(0.012)
+    # queued behind the backfill, but served as soon as the tokens are available
+    tasks.append(asyncio.ensure_future(request('cancel', 0)))
+    tasks.append(asyncio.ensure_future(request('balance', 1)))
+    await asyncio.sleep(0)
+    lengths = throttle.stats()['queueLengths']
+    assert lengths[0] == 1 and lengths[1] == 1 and lengths[3] > 0
+    await asyncio.gather(*tasks)
+    assert order.index('cancel') <= 4
+    assert order.index('balance') == order.index('cancel') + 1
+    assert [name for name in order if name.startswith('backfill')] == ['backfill' + str(i) for i in range(10)]
+
+
+async def test_exchange_priority():
+    exchange = ccxt.binance({'options': {'rateLimiterPriority': {
+        'paths': {'klines': 'backfill'},
+        'methods': {'DELETE': 'trading'},
+    }}})
+    cost, priority = exchange.calculate_rate_limiter_cost('public', 'GET', 'klines', {}, {'cost': 1})
+    assert priority == 3
+    cost, priority = exchange.calculate_rate_limiter_cost('private', 'DELETE', 'order', {}, {'cost': 1})
+    assert priority == 0
+    params = {'symbol': 'BTCUSDT', 'rateLimiterPriority': 'account'}
+    cost, priority = exchange.calculate_rate_limiter_cost('public', 'GET', 'ticker/price', params, {'cost': 1})
+    assert priority == 1
+    assert params == {'symbol': 'BTCUSDT'}
+    cost, priority = exchange.calculate_rate_limiter_cost('public', 'GET', 'depth', {}, {'cost': 1})
+    assert priority == 2
+    # enqueued in the right lane
+    for _ in range(3):
+        exchange.throttle(exchange.calculate_rate_limiter_cost('public', 'GET', 'klines', {}, {'cost': 1}))
+    assert exchange.throttle.stats()['queueLengths'] == {3: 2}
+    await exchange.close()
+    # not sent to the exchange when the lanes are not configured or the rate limiter is disabled
+    for config in [{}, {'enableRateLimit': False}]:
+        exchange = ccxt.binance(config)
+        urls = []
+
+        async def fetch(url, method='GET', headers=None, body=None):
+            urls.append(url)
+            return {}
+
+        exchange.fetch = fetch
+        await exchange.publicGetTickerPrice({'symbol': 'BTCUSDT', 'rateLimiterPriority': 'account'})
+        assert urls == ['https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT']
+        await exchange.close()
+
+
+async def main():
+    await test_lanes()
+    await test_exchange_priority()
+
+
+asyncio.run(main())
@@ -0,0 +1,38 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+from ccxt.async_support.base import throttler  # noqa: E402
+from ccxt.async_support.base.throttler import Throttler  # noqa: E402
+
+
+class StoppedClockLoop:
+    # a loop whose clock does not move, like a coarse clock between two ticks
+    def __init__(self):
+        self.timers = []
+
+    def time(self):
+        return 100.0
+
+    def call_at(self, when, callback):
+        self.timers.append(when)
+
+
+def test_schedule():
+    loop = StoppedClockLoop()
+    # the float residue of a few fractional costs
+    throttle = Throttler({'tokens': -4e-16, 'refillRate': 1 / 50}, loop)
+    throttle.schedule(loop)
+    # the wakeup is at least one clock tick ahead, not at the same instant
+    assert loop.timers == [100.0 + throttler.clock_resolution]
+    # a real deficit waits until the tokens are refilled
+    throttle = Throttler({'tokens': -1, 'refillRate': 1 / 50}, loop)
+    throttle.schedule(loop)
+    assert loop.timers[1] == 100.0 + 0.05
+
+
+test_schedule()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.async_support as ccxt  # noqa: E402
+
+
+class FakeTransport:
+    def __init__(self, responses):
+        self.responses = responses
+
+    async def request(self, method, url, headers, body, timeout):
+        content_type, content = self.responses[url]
+        text = content.decode('utf-8', errors='replace')
+        return 200, 'OK', {'Content-Type': content_type}, text, content
+
+    async def close(self):
+        pass
+
+
+async def test_transport():
+    binary = bytes(range(256))
+    exchange = ccxt.binance()
+    exchange.transport = FakeTransport({
+        'https://example.com/json': ('application/json', b'{"a":"1"}'),
+        'https://example.com/text': ('text/plain', b'hello'),
+        'https://example.com/binary': ('application/octet-stream', binary),
+    })
+    assert await exchange.fetch('https://example.com/json') == {'a': '1'}
+    assert await exchange.fetch('https://example.com/text') == 'hello'
+    # a body that is neither json nor text is returned as the raw bytes of the transport
+    assert await exchange.fetch('https://example.com/binary') == binary
+    await exchange.close()
+
+
+asyncio.run(test_transport())
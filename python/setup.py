@@ -99,6 +99,9 @@ setup(
         'type': [
             'mypy==1.6.1',
         ],
+        'http2': [
+            'httpx[http2]>=0.23',
+        ],
     },
     project_urls=project_urls,
 )